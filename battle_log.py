@@ -0,0 +1,224 @@
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+TIMESTAMP_FORMAT = "%d/%m/%Y %I:%M%p"  # Format of battle timestamps in saves and on screen
+
+
+class _BattleSeries:
+    """
+    Time-sorted index over some battles of a log: their timestamps, row numbers and
+    cumulative counts, so the totals for a time window are two binary searches.
+    """
+
+    def __init__(self):
+        self.times = array("q")
+        self.rows = array("i")
+        self.cum_won = array("q", [0])  # Battles won before each position
+        self.cum_wins = array("q", [0])
+        self.cum_draws = array("q", [0])
+        self.cum_losses = array("q", [0])
+
+    def add(self, timestamp, row, wins, draws, losses):
+        """Add a battle that is not older than any battle in the series."""
+        self.times.append(timestamp)
+        self.rows.append(row)
+        self.cum_won.append(self.cum_won[-1] + (wins > losses))
+        self.cum_wins.append(self.cum_wins[-1] + wins)
+        self.cum_draws.append(self.cum_draws[-1] + draws)
+        self.cum_losses.append(self.cum_losses[-1] + losses)
+
+    def window(self, start=None, end=None):
+        """Get the positions of the battles with start <= timestamp < end."""
+        first = 0 if start is None else bisect_left(self.times, start)
+        last = len(self.times) if end is None else bisect_left(self.times, end)
+        return first, max(first, last)
+
+    def totals(self, first, last):
+        """Get the totals of the battles between two positions."""
+        return {
+            "battles": last - first,
+            "won": self.cum_won[last] - self.cum_won[first],
+            "wins": self.cum_wins[last] - self.cum_wins[first],
+            "draws": self.cum_draws[last] - self.cum_draws[first],
+            "losses": self.cum_losses[last] - self.cum_losses[first],
+        }
+
+
+class BattleLog:
+    """
+    Battle history of a Pymon, stored column by column in typed arrays.
+    Each battle is an epoch timestamp, an opponent ID (opponent names are interned
+    once per log) and its win, draw and loss counts. Running totals make the
+    summary O(1), and timestamps are only formatted when a battle is read back.
+    Reading a battle gives the dictionary form used by saves, so a log can be
+    passed wherever a list of battle dictionaries was expected.
+    Queries use a time-sorted index for the whole log and for each opponent. It is
+    built on the first query and extended as battles are recorded; a battle older
+    than the newest one (from a merged save) makes it rebuild on the next query.
+    A battle counts as won when it has more wins than losses.
+    """
+
+    def __init__(self, stats=()):
+        """Initialize the log, optionally from battle dictionaries."""
+        self.__timestamps = array("q")
+        self.__opponents = array("i")
+        self.__wins = array("I")
+        self.__draws = array("I")
+        self.__losses = array("I")
+        self.__names = []  # opponent ID -> name
+        self.__ids = {}  # opponent name -> ID
+        self.__total_wins = 0
+        self.__total_draws = 0
+        self.__total_losses = 0
+        self.__series = None  # Time-sorted index of all battles, built on first query
+        self.__opponent_series = None  # opponent ID -> time-sorted index of its battles
+        for stat in stats:
+            self.append(stat)
+
+    @staticmethod
+    def parse_timestamp(text):
+        """Convert a formatted timestamp to epoch seconds."""
+        return int(datetime.strptime(text, TIMESTAMP_FORMAT).timestamp())
+
+    @staticmethod
+    def format_timestamp(timestamp):
+        """Convert epoch seconds to a formatted timestamp."""
+        return datetime.fromtimestamp(timestamp).strftime(TIMESTAMP_FORMAT)
+
+    def opponent_id(self, name):
+        """Get the ID of an opponent name, interning it if needed."""
+        opponent_id = self.__ids.get(name)
+        if opponent_id is None:
+            opponent_id = len(self.__names)
+            self.__ids[name] = opponent_id
+            self.__names.append(name)
+        return opponent_id
+
+    def record(self, opponent, wins, draws, losses, timestamp=None):
+        """Add a battle. The timestamp is in epoch seconds and defaults to now."""
+        if timestamp is None:
+            timestamp = int(time.time())
+        self.__timestamps.append(timestamp)
+        self.__opponents.append(self.opponent_id(opponent))
+        self.__wins.append(wins)
+        self.__draws.append(draws)
+        self.__losses.append(losses)
+        self.__total_wins += wins
+        self.__total_draws += draws
+        self.__total_losses += losses
+        if self.__series is not None:
+            if self.__series.times and timestamp < self.__series.times[-1]:
+                self.__series = None
+                self.__opponent_series = None
+            else:
+                self.__index_row(len(self.__timestamps) - 1)
+
+    def append(self, stat):
+        """Add a battle from its dictionary form."""
+        timestamp = stat["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = self.parse_timestamp(timestamp)
+        self.record(stat["opponent"], int(stat["wins"]), int(stat["draws"]), int(stat["losses"]), timestamp)
+
+    def __index_row(self, row):
+        """Add one battle to the query indexes."""
+        opponent_id = self.__opponents[row]
+        series = self.__opponent_series.get(opponent_id)
+        if series is None:
+            series = self.__opponent_series[opponent_id] = _BattleSeries()
+        values = (self.__timestamps[row], row, self.__wins[row], self.__draws[row], self.__losses[row])
+        self.__series.add(*values)
+        series.add(*values)
+
+    def __build_index(self):
+        """Build the query indexes, ordering battles by timestamp."""
+        self.__series = _BattleSeries()
+        self.__opponent_series = {}
+        timestamps = self.__timestamps
+        for row in sorted(range(len(timestamps)), key=timestamps.__getitem__):
+            self.__index_row(row)
+
+    def __select(self, opponent):
+        """Get the index for one opponent or for all battles, or None for an unknown opponent."""
+        if self.__series is None:
+            self.__build_index()
+        if opponent is None:
+            return self.__series
+        opponent_id = self.__ids.get(opponent)
+        if opponent_id is None:
+            return None
+        return self.__opponent_series[opponent_id]
+
+    def opponents(self):
+        """Get the names of all opponents in the log."""
+        return list(self.__names)
+
+    def query(self, opponent=None, start=None, end=None):
+        """
+        Get the number of battles, battles won and wins, draws and losses against
+        an opponent (or all opponents) with start <= timestamp < end, in O(log n).
+        """
+        series = self.__select(opponent)
+        if series is None:
+            return {"battles": 0, "won": 0, "wins": 0, "draws": 0, "losses": 0}
+        first, last = series.window(start, end)
+        return series.totals(first, last)
+
+    def longest_losing_streak(self, opponent=None, start=None, end=None):
+        """Get the longest run of consecutive lost battles in a window, in O(k) for k battles."""
+        series = self.__select(opponent)
+        if series is None:
+            return 0
+        first, last = series.window(start, end)
+        longest = streak = 0
+        for position in range(first, last):
+            row = series.rows[position]
+            if self.__wins[row] > self.__losses[row]:
+                streak = 0
+            else:
+                streak += 1
+                longest = max(longest, streak)
+        return longest
+
+    def totals(self):
+        """Get the total wins, draws and losses over all battles."""
+        return self.__total_wins, self.__total_draws, self.__total_losses
+
+    def __len__(self):
+        return len(self.__timestamps)
+
+    def __getitem__(self, index):
+        """Get one battle in its dictionary form."""
+        return {
+            "timestamp": self.format_timestamp(self.__timestamps[index]),
+            "opponent": self.__names[self.__opponents[index]],
+            "wins": self.__wins[index],
+            "draws": self.__draws[index],
+            "losses": self.__losses[index],
+        }
+
+    def __iter__(self):
+        for index in range(len(self.__timestamps)):
+            yield self[index]
+
+
+def query_battles(logs, opponent=None, start=None, end=None):
+    """
+    Combine battle queries over several Pymons, given as (nickname, BattleLog) pairs.
+    Returns the summed totals, the win rate (battles won / battles, None without
+    battles) and the longest losing streak with the nickname of the Pymon it belongs to.
+    """
+    result = {"battles": 0, "won": 0, "wins": 0, "draws": 0, "losses": 0}
+    longest_streak, streak_pymon = 0, None
+    for nickname, log in logs:
+        for key, value in log.query(opponent, start, end).items():
+            result[key] += value
+        streak = log.longest_losing_streak(opponent, start, end)
+        if streak > longest_streak:
+            longest_streak, streak_pymon = streak, nickname
+    result["win_rate"] = result["won"] / result["battles"] if result["battles"] else None
+    result["longest_losing_streak"] = longest_streak
+    result["streak_pymon"] = streak_pymon
+    return result
@@ -0,0 +1,99 @@
+from exceptions import GameError
+from creature import THRESHOLD, WIN_THRESHOLD, LOSS_ENERGY_RATE
+from item import MAX_ENERGY
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch simulations
+    np = None
+
+MOVES = ("r", "p", "s")  # Move codes 0, 1 and 2
+# (player - opponent) % 3 gives the round result: 0 = draw, 1 = win, 2 = lose
+RESULT_DRAW, RESULT_WIN, RESULT_LOSE = 0, 1, 2
+CHUNK_SIZE = 1000000  # Challenges simulated together, bounds peak memory
+MAX_ROUNDS = 1000  # Rounds after which a challenge stuck on draws is counted as unfinished
+
+
+def simulate_challenges(n, energy=MAX_ENERGY, has_immunity=False, player_weights=None, seed=None,
+                        max_rounds=MAX_ROUNDS):
+    """
+    Simulate n independent Pymon challenges at once, without any input or output.
+    Follows the rules of Pymon.challenge: the battle runs while the Pymon has energy
+    until either side reaches THRESHOLD encounter wins, a lost encounter costs energy
+    unless the Pymon is immune (which uses up the immunity), and the creature is
+    captured when the Pymon reaches WIN_THRESHOLD wins.
+    The opponent plays uniformly at random; player_weights optionally gives the
+    probabilities of the player choosing rock, paper and scissors.
+    A drawn round changes nothing, so every challenge ends in a win or a loss; the
+    draws are counted per round, as in the battle stats of a Pymon.
+    Returns a dictionary with the number of won and lost challenges, the number still
+    unfinished after max_rounds (practically 0), the total number of drawn rounds, and
+    the count of challenges ending with each energy level.
+    """
+    if np is None:
+        raise GameError("NumPy is required for batch battle simulation.")
+    if n < 0:
+        raise ValueError("Number of challenges must not be negative.")
+
+    rng = np.random.default_rng(seed)
+    if player_weights is not None:
+        player_weights = np.asarray(player_weights, dtype=float)
+        player_weights = player_weights / player_weights.sum()
+
+    result = {
+        "wins": 0,
+        "losses": 0,
+        "unfinished": 0,
+        "draws": 0,
+        "energy_left": np.zeros(MAX_ENERGY + 1, dtype=np.int64),
+    }
+    remaining = n
+    while remaining > 0:
+        size = min(remaining, CHUNK_SIZE)
+        _simulate_chunk(rng, size, energy, has_immunity, player_weights, max_rounds, result)
+        remaining -= size
+    return result
+
+
+def _simulate_chunk(rng, size, energy, has_immunity, player_weights, max_rounds, result):
+    """Simulate one chunk of challenges and add the outcomes to the result."""
+    energies = np.full(size, energy, dtype=np.int8)
+    immunities = np.full(size, has_immunity, dtype=bool)
+    wins = np.zeros(size, dtype=np.int16)
+    losses = np.zeros(size, dtype=np.int16)
+    active = np.arange(size)
+
+    for _ in range(max_rounds):
+        # Same stop conditions as the loop in Pymon.challenge
+        still_going = (
+            (energies[active] > 0)
+            & (wins[active] < THRESHOLD)
+            & (losses[active] < THRESHOLD)
+        )
+        active = active[still_going]
+        if active.size == 0:
+            break
+
+        if player_weights is None:
+            player = rng.integers(0, 3, size=active.size, dtype=np.int8)
+        else:
+            player = rng.choice(3, size=active.size, p=player_weights).astype(np.int8)
+        opponent = rng.integers(0, 3, size=active.size, dtype=np.int8)
+        outcome = (player - opponent) % 3
+
+        wins[active[outcome == RESULT_WIN]] += 1
+        result["draws"] += int(np.count_nonzero(outcome == RESULT_DRAW))
+
+        lost = active[outcome == RESULT_LOSE]
+        losses[lost] += 1
+        immune = immunities[lost]
+        unprotected = lost[~immune]
+        energies[unprotected] = np.maximum(energies[unprotected] + LOSS_ENERGY_RATE, 0)
+        immunities[lost[immune]] = False
+
+    captured = wins == WIN_THRESHOLD
+    finished = (energies <= 0) | (wins >= THRESHOLD) | (losses >= THRESHOLD)
+    result["wins"] += int(np.count_nonzero(captured))
+    result["losses"] += int(np.count_nonzero(finished & ~captured))
+    result["unfinished"] += int(np.count_nonzero(~finished))
+    result["energy_left"] += np.bincount(energies, minlength=MAX_ENERGY + 1)[:MAX_ENERGY + 1]
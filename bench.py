@@ -0,0 +1,166 @@
+from item import MAX_ENERGY
+from battle_log import BattleLog
+
+
+class BenchPymon:
+    """A captured Pymon resting on the bench, stored without per-instance dictionaries."""
+
+    __slots__ = (
+        "nickname",
+        "description",
+        "inventory",
+        "__energy",
+        "has_immunity",
+        "move_count",
+        "battle_stats",
+    )
+
+    def __init__(self, nickname, description, inventory=None, energy=MAX_ENERGY, has_immunity=False,
+                 move_count=0, battle_stats=None):
+        """Initialize a bench entry; inventory holds item names."""
+        self.nickname = nickname
+        self.description = description
+        self.inventory = inventory if inventory is not None else []
+        self.__energy = energy
+        self.has_immunity = has_immunity
+        self.move_count = move_count
+        if not isinstance(battle_stats, BattleLog):
+            battle_stats = BattleLog(battle_stats or ())
+        self.battle_stats = battle_stats
+
+    @property
+    def energy(self):
+        """Getter for the energy; it is fixed while on the bench, since Bench buckets entries by it."""
+        return self.__energy
+
+    @classmethod
+    def from_pymon(cls, pymon):
+        """Create a bench entry from a live Pymon."""
+        return cls(
+            pymon.nickname,
+            pymon.desc,
+            [item.name for item in pymon.inventory],
+            pymon.energy,
+            pymon.has_immunity,
+            pymon.move_count,
+            pymon.battle_stats,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a bench entry from the dictionary form used by saves."""
+        stats = data.get("stats", {})
+        return cls(
+            data["nickname"],
+            data.get("description", ""),
+            list(data.get("inventory", [])),
+            stats.get("energy", MAX_ENERGY),
+            stats.get("has_immunity", False),
+            stats.get("move_count", 0),
+            stats.get("battle_stats"),
+        )
+
+    def to_dict(self):
+        """Get the dictionary form used by saves."""
+        return {
+            "nickname": self.nickname,
+            "description": self.description,
+            "inventory": list(self.inventory),
+            "stats": {
+                "energy": self.energy,
+                "has_immunity": self.has_immunity,
+                "move_count": self.move_count,
+                "battle_stats": self.battle_stats,
+            },
+        }
+
+
+class Bench:
+    """
+    The captured Pymons of a player.
+    Entries live in a list of slots with a nickname -> slot index, so adding,
+    finding, removing and swapping a Pymon are all O(1). Removing moves the last
+    entry into the freed slot.
+    Nicknames are also grouped by energy level, so the Pymons that can still
+    battle are listed in O(k) and the one with the most energy is found in O(1).
+    A benched Pymon is bucketed by the energy it has when it is added or swapped
+    in; BenchPymon.energy is read-only, so the buckets cannot go stale.
+    """
+
+    def __init__(self, pymons=()):
+        """Initialize the bench, optionally with BenchPymon entries."""
+        self.__slots = []
+        self.__index = {}  # nickname -> slot
+        self.__buckets = [{} for _ in range(MAX_ENERGY + 1)]  # energy -> ordered set of nicknames
+        for pymon in pymons:
+            self.add(pymon)
+
+    def __len__(self):
+        return len(self.__slots)
+
+    def __iter__(self):
+        return iter(self.__slots)
+
+    def __getitem__(self, slot):
+        return self.__slots[slot]
+
+    def add(self, pymon):
+        """Add a Pymon to the bench. Nicknames must be unique."""
+        if pymon.nickname in self.__index:
+            raise ValueError(f"{pymon.nickname} is already on the bench.")
+        self.__index[pymon.nickname] = len(self.__slots)
+        self.__slots.append(pymon)
+        self.__bucket(pymon.energy)[pymon.nickname] = None
+
+    def find(self, nickname):
+        """Find a Pymon on the bench by nickname."""
+        slot = self.__index.get(nickname)
+        return None if slot is None else self.__slots[slot]
+
+    def slot_of(self, nickname):
+        """Get the slot of a Pymon by nickname, or None."""
+        return self.__index.get(nickname)
+
+    def remove(self, nickname):
+        """Remove a Pymon by nickname and return it, or None if it is not on the bench."""
+        slot = self.__index.pop(nickname, None)
+        if slot is None:
+            return None
+        pymon = self.__slots[slot]
+        del self.__bucket(pymon.energy)[nickname]
+        last = self.__slots.pop()
+        if last is not pymon:
+            self.__slots[slot] = last
+            self.__index[last.nickname] = slot
+        return pymon
+
+    def swap(self, slot, pymon):
+        """Put a Pymon in a slot and return the Pymon that was there."""
+        old = self.__slots[slot]
+        del self.__index[old.nickname]
+        if pymon.nickname in self.__index:
+            self.__index[old.nickname] = slot
+            raise ValueError(f"{pymon.nickname} is already on the bench.")
+        del self.__bucket(old.energy)[old.nickname]
+        self.__slots[slot] = pymon
+        self.__index[pymon.nickname] = slot
+        self.__bucket(pymon.energy)[pymon.nickname] = None
+        return old
+
+    def __bucket(self, energy):
+        """Get the nickname set for an energy level."""
+        return self.__buckets[max(0, min(energy, MAX_ENERGY))]
+
+    def available(self):
+        """Yield the Pymons that still have energy, most energy first."""
+        for energy in range(MAX_ENERGY, 0, -1):
+            for nickname in self.__buckets[energy]:
+                yield self.__slots[self.__index[nickname]]
+
+    def best(self):
+        """Get the Pymon with the most energy, or None if no benched Pymon has energy."""
+        for energy in range(MAX_ENERGY, 0, -1):
+            bucket = self.__buckets[energy]
+            if bucket:
+                return self.__slots[self.__index[next(iter(bucket))]]
+        return None
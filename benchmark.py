@@ -0,0 +1,215 @@
+"""
+Benchmarks for the hot paths of the game: loading the world, saving and loading the
+game state, moving and battling, on worlds of any size made by world_gen.
+
+Usage: python benchmark.py [--sizes 10,1000,100000] [--save-baseline FILE] [--baseline FILE]
+
+Every benchmark reports operations per second (locations for load and load_cached, saves or loads
+of the game state, single moves and single battles) as the median of several timed
+repeats, and the peak memory traced while it runs. Results can be saved as a JSON baseline;
+comparing a later run against it flags every benchmark that got slower or uses more memory
+than the tolerance allows.
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from bench import BenchPymon
+from creature import Pymon
+from game_state import GameState
+from item import MAX_ENERGY
+from record import Record
+from simulation import HeadlessPymon
+from world_graph import DIRECTIONS
+from world_gen import generate_world, TOPOLOGIES
+
+DEFAULT_SIZES = (10, 1000, 100000)  # Locations in the synthetic worlds; up to 1000000 works
+MIN_TIME = 0.1  # Seconds one timed repeat runs an operation for, to smooth out short operations
+REPEATS = 5  # Timed repeats per benchmark; the median is reported
+MOVES = 10000  # Moves per move benchmark
+CHALLENGES = 2000  # Battles per challenge benchmark
+TOLERANCE = 0.25  # Allowed relative slowdown or memory growth against a baseline
+
+
+def timed_repeat(operation):
+    """Run an operation until MIN_TIME has passed and return the seconds per run."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        operation()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            return elapsed / runs
+
+
+def timed(operation):
+    """Get the median seconds per run of an operation over REPEATS timed repeats, after a warm-up run."""
+    operation()
+    return statistics.median(timed_repeat(operation) for _ in range(REPEATS))
+
+
+def traced_peak(operation):
+    """Run an operation once and return the peak memory it allocated, in KiB."""
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure(operation, ops, memory=True):
+    """Measure an operation doing ops units of work."""
+    seconds = timed(operation)
+    result = {"ops_per_sec": ops / seconds, "seconds": seconds}
+    if memory:
+        result["peak_kib"] = traced_peak(operation)
+    return result
+
+
+def game_state_for(size, locations):
+    """Build a game state with a bench and a battle history that grow with the world."""
+    pymon = Pymon("Kimimon", "White and yellow Pymon with a square face", locations[0])
+    for i in range(size):
+        pymon.battle_stats.record(f"C{i % 100}", i % 3, 1, 2 - i % 3, 1700000000 + i)
+    game_state = GameState()
+    for i in range(max(1, size // 10)):
+        game_state.bench_pymons.add(BenchPymon(f"B{i}", f"bench Pymon {i}", ["apple"]))
+    return pymon, game_state
+
+
+def bench_size(size, directory, memory=True, topology="grid"):
+    """Run every benchmark on a generated world of the given size."""
+    locations_file, creatures_file, items_file = generate_world(directory, size, topology)
+    results = {}
+
+    def load():
+        Record().load_data(locations_file, creatures_file, items_file, rng=random.Random(0))
+
+    results[f"load/{size}"] = measure(load, size, memory)
+
+    def load_cached():
+        Record().load_data(locations_file, creatures_file, items_file, rng=random.Random(0), cache=True)
+
+    load_cached()  # Write the compiled world cache, so every measured run hits it
+    results[f"load_cached/{size}"] = measure(load_cached, size, memory)
+
+    record = Record()
+    record.load_data(locations_file, creatures_file, items_file, rng=random.Random(0))
+    pymon, state = game_state_for(size, record.locations)
+    record.game_state = state
+    record.sync_user_pymon(pymon)
+    save_file = os.path.join(directory, "save.csv")
+    results[f"save/{size}"] = measure(lambda: state.save_game(save_file), 1, memory)
+    results[f"load_state/{size}"] = measure(lambda: GameState().load_game(save_file), 1, memory)
+
+    rng = random.Random(0)
+
+    def new_walker():
+        """A fresh walker for every run, so no run inherits the battle history of the last."""
+        return HeadlessPymon("Walker", "benchmark Pymon", record.locations[0], rng)
+
+    def move():
+        walker = new_walker()
+        for _ in range(MOVES):
+            doors = [direction for direction in DIRECTIONS if walker.loc.get_door(direction)]
+            if not doors:
+                walker.loc = record.locations[0]
+                continue
+            walker.energy = MAX_ENERGY
+            walker.move(rng.choice(doors))
+
+    results[f"move/{size}"] = measure(move, MOVES, memory)
+
+    opponent = Pymon("Rival", "benchmark opponent")
+
+    def challenge():
+        walker = new_walker()
+        for _ in range(CHALLENGES):
+            walker.energy = MAX_ENERGY
+            walker.challenge(opponent)
+
+    results[f"challenge/{size}"] = measure(challenge, CHALLENGES, memory)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, memory=True, topology="grid"):
+    """Run the benchmarks for every size with the game output discarded."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as null_output:
+        for size in sizes:
+            with contextlib.redirect_stdout(null_output):
+                size_results = bench_size(size, directory, memory, topology)
+            for name, result in size_results.items():
+                results[name] = result
+                report(name, result)
+    return results
+
+
+def report(name, result):
+    """Print the result of one benchmark."""
+    line = f"{name:<24} {result['ops_per_sec']:>14,.1f} ops/sec"
+    if "peak_kib" in result:
+        line += f" {result['peak_kib']:>14,.1f} KiB peak"
+    print(line)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """List the benchmarks that are slower or use more memory than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            change = 1 - result["ops_per_sec"] / base["ops_per_sec"]
+            regressions.append(f"{name}: {change:.0%} slower ({result['ops_per_sec']:,.1f} ops/sec)")
+        if "peak_kib" in result and "peak_kib" in base and result["peak_kib"] > base["peak_kib"] * (1 + tolerance):
+            change = result["peak_kib"] / base["peak_kib"] - 1
+            regressions.append(f"{name}: {change:.0%} more memory ({result['peak_kib']:,.1f} KiB)")
+    return regressions
+
+
+def main():
+    """Command-line entry point of the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark loading, saving, moving and battling.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated world sizes in locations (10 to 1000000)")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="grid", help="shape of the generated worlds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurements")
+    parser.add_argument("--save-baseline", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the results against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"allowed relative slowdown or memory growth (default: {TOLERANCE})")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, memory=not args.no_memory, topology=args.topology)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import contextlib
+import os
+from renderer import QUIET_RENDERER
+
+
+class Console:
+    """Player input for the game, read from the keyboard."""
+
+    def read(self, prompt=""):
+        """Show a prompt and read one line of input."""
+        return input(prompt)
+
+    def pause(self, prompt="Press enter to continue"):
+        """Wait for the player before going on."""
+        input(prompt)
+
+
+class ScriptedConsole(Console):
+    """
+    Player input replayed from a script: any iterable of lines, such as an open
+    command file or a list. Every read takes the next line, pauses are skipped,
+    and EOFError is raised when the script runs out, like input() at the end of stdin.
+    """
+
+    def __init__(self, lines):
+        """Initialize the console with the lines of a script."""
+        self.__lines = iter(lines)
+        self.__reads = 0
+
+    @property
+    def reads(self):
+        """Getter for the number of lines read so far."""
+        return self.__reads
+
+    def read(self, prompt=""):
+        """Return the next line of the script."""
+        try:
+            line = next(self.__lines)
+        except StopIteration:
+            raise EOFError("End of script")
+        self.__reads += 1
+        return line.rstrip("\r\n")
+
+    def pause(self, prompt="Press enter to continue"):
+        """Scripts do not wait."""
+
+
+def run_script(operation, lines, output=None):
+    """
+    Drive an Operation's menu from a script until the script ends or the game exits.
+    Game output goes to the output stream, or is discarded when output is None;
+    screens are then not even built.
+    Returns the number of script lines read.
+    """
+    console = ScriptedConsole(lines)
+    operation.console = console
+    renderer = operation.renderer
+    with contextlib.ExitStack() as stack:
+        if output is None:
+            output = stack.enter_context(open(os.devnull, "w"))
+            operation.renderer = QUIET_RENDERER
+        with contextlib.redirect_stdout(output):
+            try:
+                operation.menu()
+            except (EOFError, SystemExit):
+                pass  # The script ended, or the game was quit or lost
+            finally:
+                operation.renderer = renderer
+    return console.reads
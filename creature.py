@@ -1,8 +1,14 @@
 from exceptions import InvalidDirectionException, AnimalCaptureError, GameError
 import sys
 import random
-import datetime
+import time
 from item import MAX_ENERGY
+from world_graph import DIRECTIONS
+from battle_log import BattleLog
+from console import Console
+from renderer import DEFAULT_RENDERER
+
+DEFAULT_CONSOLE = Console()  # Console of Pymons that are not played through an Operation
 
 THRESHOLD = 2  # Number of wins needed to capture a creature
 LOSS_ENERGY_RATE = -1
@@ -49,12 +55,32 @@ class Pymon(Creature):
         self.__inventory = []  # Pymon inventory to store items
         self.__has_immunity = False
         self.__move_count = 0
-        self.__battle_stats = []
+        self.__battle_stats = BattleLog()
         self.__wins = 0
         self.__losses = 0
         self.__draws = 0
         self.__current_battle_opponent = None
         self.__last_battle_timestamp = None
+        self.__console = DEFAULT_CONSOLE
+        self.__renderer = DEFAULT_RENDERER
+
+    @property
+    def console(self):
+        """Getter for the console the player's choices are read from."""
+        return self.__console
+
+    @console.setter
+    def console(self, new_console):
+        self.__console = new_console
+
+    @property
+    def renderer(self):
+        """Getter for the renderer screens are written with."""
+        return self.__renderer
+
+    @renderer.setter
+    def renderer(self, new_renderer):
+        self.__renderer = new_renderer
 
     @property
     def battle_stats(self):
@@ -62,6 +88,8 @@ class Pymon(Creature):
 
     @battle_stats.setter
     def battle_stats(self, new_stats):
+        if not isinstance(new_stats, BattleLog):
+            new_stats = BattleLog(new_stats)  # Battle dictionaries from a save
         self.__battle_stats = new_stats
 
     @property
@@ -107,16 +135,16 @@ class Pymon(Creature):
         self.__move_count = new_move_count
 
     def pick_item(self, item):
-        """Attempt to pick up an item."""
-        if item.name.lower() == "tree":
-            print("The tree is just for decoration and cannot be picked up.")
-            return
+        """Attempt to pick up an item. Returns True if the item can be taken into the inventory."""
+        if item.effect is not None and item.effect.decoration:
+            print(f"The {item.name} is just for decoration and cannot be picked up.")
+            return False
 
         if item.is_pickable:
-            self.inventory.append(item)
             print(f"You picked up {item.name} from the ground!")
-        else:
-            print(f"The {item.name} cannot be picked up.")
+            return True
+        print(f"The {item.name} cannot be picked up.")
+        return False
 
     def view_inventory(self):
         """Display the items in the inventory and allow using an item."""
@@ -129,7 +157,7 @@ class Pymon(Creature):
                 print(f"{index}) {item.name} - {item.desc}")
 
             # Allow user to select an item to use
-            item_choice = input("Select an item number to use or press Enter to skip: ")
+            item_choice = self.console.read("Select an item number to use or press Enter to skip: ")
             if item_choice.isdigit():
                 item_index = int(item_choice) - 1
                 if 0 <= item_index < len(self.inventory):
@@ -143,14 +171,15 @@ class Pymon(Creature):
 
     def move(self, direction, game_state=None):
         """Move in the specified direction. Returns True if energy is depleted."""
-        doors_dict = self.loc.doors.to_dict()
-        if direction in doors_dict and doors_dict[direction]:
-            self.loc = doors_dict[direction]
-            self.display_new_location()
+        new_loc = self.loc.get_door(direction)
+        if new_loc:
+            self.loc = new_loc
+            with self.__renderer.screen() as screen:
+                self.display_new_location(screen)
 
-            self.move_count += 1
-            if self.move_count % 2 == 0:
-                self.decrease_energy()
+                self.move_count += 1
+                if self.move_count % 2 == 0:
+                    self.decrease_energy(screen)
 
             if self.energy <= 0:
                 self.handle_energy_depletion(game_state)
@@ -160,19 +189,25 @@ class Pymon(Creature):
 
         return False
 
-    def display_new_location(self):
-        """Display information about the new location after moving."""
-        print(f"You traveled and arrived at {self.loc.name}.")
-        print("Creatures in the new location:")
-        for creature in self.loc.creatures:
-            print(f"- {creature.nickname}")
+    def display_new_location(self, screen=None):
+        """Display information about the new location after moving, on its own screen if none is given."""
+        if screen is None:
+            with self.__renderer.screen() as screen:
+                self.display_new_location(screen)
+            return
+        screen.line("You traveled and arrived at {}.", self.loc.name)
+        screen.line("Creatures in the new location:")
+        screen.lines("- {}", ((creature.nickname,) for creature in self.loc.creatures))
 
-    def decrease_energy(self):
+    def decrease_energy(self, screen=None):
         """Decrease Pymon's energy after every 2 moves and display the status."""
         self.energy = self.energy - 1
-        print(
-            f"{self.nickname} lost 1 energy due to movement. Energy: {self.__energy}/{MAX_ENERGY}"
-        )
+        message = "{} lost 1 energy due to movement. Energy: {}/{}"
+        if screen is None:
+            with self.__renderer.screen() as screen:
+                screen.line(message, self.nickname, self.__energy, MAX_ENERGY)
+        else:
+            screen.line(message, self.nickname, self.__energy, MAX_ENERGY)
 
     def handle_energy_depletion(self, game_state):
         """Handle the situation when the Pymon is out of energy."""
@@ -180,11 +215,7 @@ class Pymon(Creature):
 
         # Remove the Pymon from the bench
         if game_state and game_state.bench_pymons:
-            # Find and remove the current Pymon from the bench
-            for i, pymon in enumerate(game_state.bench_pymons):
-                if pymon["nickname"] == self.nickname:
-                    game_state.bench_pymons.pop(i)
-                    break
+            game_state.bench_pymons.remove(self.nickname)
 
             available_pymons = self.get_available_pymons(game_state.bench_pymons)
             if available_pymons:
@@ -195,23 +226,15 @@ class Pymon(Creature):
             self.end_game()
 
     def get_available_pymons(self, bench_pymons):
-        """Check and display Pymons on the bench that still have energy."""
+        """Check and display Pymons on the bench that still have energy, most energy first."""
         available_pymons = []
         print("\nAvailable Pymons on bench:")
-        for i, pymon in enumerate(bench_pymons, 1):
-            temp_pymon = self.create_temp_pymon(pymon)
-            if temp_pymon.energy > 0:
-                available_pymons.append((i, pymon))
-                print(f"{i}) {pymon['nickname']} - Energy: {temp_pymon.energy}/3")
+        for pymon in bench_pymons.available():
+            i = bench_pymons.slot_of(pymon.nickname) + 1
+            available_pymons.append((i, pymon))
+            print(f"{i}) {pymon.nickname} - Energy: {pymon.energy}/3")
         return available_pymons
 
-    def create_temp_pymon(self, pymon_data):
-        """Create a temporary Pymon to check its energy."""
-        temp_pymon = Pymon(pymon_data["nickname"], pymon_data["description"])
-        if "stats" in pymon_data and "energy" in pymon_data["stats"]:
-            temp_pymon.energy = pymon_data["stats"]["energy"]
-        return temp_pymon
-
     def end_game(self):
         """End the game if no Pymons with energy are available."""
         print("No Pymons with energy available. Game over.")
@@ -241,14 +264,14 @@ class Pymon(Creature):
             self.update_battle_results(result)
 
         self.handle_immunity_removal(had_immunity)
-        self.__last_battle_timestamp = datetime.datetime.now().strftime("%d/%m/%Y %I:%M%p")
+        self.__last_battle_timestamp = int(time.time())
         self.generate_stats()
 
         return self.handle_outcome(creature)
 
     def get_player_choice(self):
         """Prompt the player to choose rock, paper, or scissors."""
-        player_choice = input("Your turn (r)ock, (p)aper, or (s)cissor?: ").lower()
+        player_choice = self.console.read("Your turn (r)ock, (p)aper, or (s)cissor?: ").lower()
         if player_choice not in ["r", "p", "s"]:
             print("Invalid choice, please choose r, p, or s.")
             return None
@@ -283,23 +306,21 @@ class Pymon(Creature):
             self.has_immunity = False  # Remove immunity after it's used
 
     def handle_immunity_removal(self, had_immunity):
-        """Remove the magic potion from inventory if immunity was used."""
+        """Remove the item that gave immunity from inventory if immunity was used."""
         if had_immunity:
             for item in self.inventory.copy():  # Avoid modifying inventory directly
-                if item.name.lower() == "magic potion":
+                if item.effect is not None and item.effect.immunity and item.is_consumable:
                     self.inventory.remove(item)
                     break
 
     def generate_stats(self):
         """Record the battle statistics with a timestamp."""
-        self.battle_stats.append(
-            {
-                "timestamp": self.__last_battle_timestamp,
-                "opponent": self.__current_battle_opponent,
-                "wins": self.__wins,
-                "draws": self.__draws,
-                "losses": self.__losses,
-            }
+        self.battle_stats.record(
+            self.__current_battle_opponent,
+            self.__wins,
+            self.__draws,
+            self.__losses,
+            self.__last_battle_timestamp,
         )
 
     def handle_outcome(self, creature):
@@ -319,16 +340,16 @@ class Pymon(Creature):
 
     def display_battle_stats(self):
         """Get and display the battle statistics for the Pymon."""
-        total_w, total_d, total_l = 0, 0, 0
-        print(f'Pymon Nickname: "{self.nickname}"')
-        for i, stat in enumerate(self.__battle_stats, start=1):
-            print(
-                f"Battle {i}, {stat['timestamp']} Opponent: \"{stat['opponent']}\", W: {stat['wins']} D: {stat['draws']} L: {stat['losses']}"
+        with self.__renderer.screen() as screen:
+            screen.line('Pymon Nickname: "{}"', self.nickname)
+            screen.lines(
+                'Battle {}, {} Opponent: "{}", W: {} D: {} L: {}',
+                (
+                    (i, stat["timestamp"], stat["opponent"], stat["wins"], stat["draws"], stat["losses"])
+                    for i, stat in enumerate(self.__battle_stats, start=1)
+                ),
             )
-            total_w += stat["wins"]
-            total_d += stat["draws"]
-            total_l += stat["losses"]
-        print(f"Total: W: {total_w} D: {total_d} L: {total_l}")
+            screen.line("Total: W: {} D: {} L: {}", *self.__battle_stats.totals())
 
     def battle_judge(self, player_choice, opponent_choice):
         """Resolve the rock-paper-scissor battle."""
@@ -351,47 +372,14 @@ class Pymon(Creature):
             print("Invalid item.")
             return
 
-        item_name = item.name.lower()
-
-        if item_name == "tree":
-            self.use_tree(item)
-        elif item_name == "apple":
-            self.use_apple(item)
-        elif item_name == "magic potion":
-            self.use_magic_potion()
-        elif item_name == "binocular":
-            self.use_binocular()
-        else:
+        if item.effect is None:
             print(f"{item.name} cannot be used.")
-
-    def use_tree(self, item):
-        """Handle the case where a tree item is attempted to be used."""
-        print("Trees are just for decoration and cannot be used.")
-
-    def use_apple(self, item):
-        """Handle the case where an apple item is used."""
-        if self.__energy < 3:
-            self.__energy = min(3, self.__energy + 1)
-            self.__inventory.remove(item)
-            print(f"{self.nickname} ate the apple. Energy: {self.__energy}/3")
-        else:
-            print(f"{self.nickname} is already at full energy.")
-
-    def use_magic_potion(self):
-        """Handle the case where a magic potion is used."""
-        if not self.has_immunity:
-            self.has_immunity = True
-            print(
-                f"{self.nickname} used the magic potion and is now immune for one battle."
-            )
-        else:
-            print(
-                f"{self.nickname} already has immunity active. Potion cannot be used."
-            )
+            return
+        item.effect.apply(self, item)
 
     def use_binocular(self):
         """Handle the case where binoculars are used."""
-        direction = input(
+        direction = self.console.read(
             "Use binocular to view (current/west/north/east/south): "
         ).lower()
 
@@ -413,8 +401,8 @@ class Pymon(Creature):
             if creatures:
                 loc_desc.append(", ".join(creatures))
 
-        doors_dict = self.loc.doors.to_dict()
-        for direction, loc in doors_dict.items():
+        for direction in DIRECTIONS:
+            loc = self.loc.get_door(direction)
             if loc:
                 loc_desc.append(f"in the {direction} is {loc.name}")
 
@@ -425,9 +413,8 @@ class Pymon(Creature):
 
     def view_connected_loc(self, direction):
         """Display information about a connected location in a given direction."""
-        doors_dict = self.loc.doors.to_dict()
-        if direction in doors_dict and doors_dict[direction]:
-            connected_loc = doors_dict[direction]
+        connected_loc = self.loc.get_door(direction)
+        if connected_loc:
             items = (
                 [item.name for item in connected_loc.items]
                 if hasattr(connected_loc, "items")
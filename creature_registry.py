@@ -0,0 +1,83 @@
+import os
+
+
+class CreatureRegistry:
+    """
+    Append-only writer for creatures.csv.
+    The file stays open for appending and the nicknames already in it are kept in
+    a set, so adding a creature costs the same however large the file grows.
+    """
+
+    def __init__(self, file_path, nicknames=None):
+        """
+        Open the registry for a creatures file. The known nicknames can be passed in
+        (e.g. from the loaded creatures); otherwise the file is read once to collect them.
+        """
+        self.__file_path = file_path
+        if nicknames is None:
+            nicknames = self.__read_nicknames()
+        self.__nicknames = set(nicknames)
+        self.__file = None
+
+    @property
+    def file_path(self):
+        """Getter for the creatures file path."""
+        return self.__file_path
+
+    def __read_nicknames(self):
+        """Collect the nicknames in the file in one streaming pass."""
+        nicknames = set()
+        if not os.path.exists(self.__file_path):
+            return nicknames
+        with open(self.__file_path, "r") as f:
+            for line in f:
+                nickname = line.split(",", 1)[0].strip()
+                if nickname:
+                    nicknames.add(nickname)
+        return nicknames
+
+    def __open(self):
+        """Open the file for appending, starting on a new line."""
+        if self.__file is None:
+            ends_with_newline = True
+            if os.path.exists(self.__file_path) and os.path.getsize(self.__file_path):
+                with open(self.__file_path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    ends_with_newline = f.read(1) == b"\n"
+            self.__file = open(self.__file_path, "a")
+            if not ends_with_newline:
+                self.__file.write("\n")
+        return self.__file
+
+    def contains(self, nickname):
+        """Check whether a nickname is already taken."""
+        return nickname in self.__nicknames
+
+    def add(self, nickname, desc, adoptable):
+        """Append one creature. Raises ValueError if the nickname is taken."""
+        self.add_many([(nickname, desc, adoptable)])
+
+    def add_many(self, creatures):
+        """
+        Append (nickname, description, adoptable) rows in a single buffered write.
+        Nothing is written if any nickname is taken or repeated.
+        """
+        batch = set()
+        lines = []
+        for nickname, desc, adoptable in creatures:
+            if nickname in self.__nicknames or nickname in batch:
+                raise ValueError(f"Creature nickname must be unique: {nickname}")
+            batch.add(nickname)
+            lines.append(f"{nickname}, {desc}, {adoptable}\n")
+        if not lines:
+            return
+        f = self.__open()
+        f.write("".join(lines))
+        f.flush()
+        self.__nicknames.update(batch)
+
+    def close(self):
+        """Close the file."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
@@ -92,3 +92,11 @@ class AnimalCaptureError(Exception):
     def __init__(self):
         msg = "Animals cannot be captured or added to the bench. Only Pymons can be captured in battle."
         super().__init__(msg)
+
+
+class GameOverException(Exception):
+    """Exception raised when a game without a player ends because no Pymon has energy left."""
+
+    def __init__(self):
+        msg = "No Pymons with energy available. Game over."
+        super().__init__(msg)
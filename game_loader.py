@@ -64,44 +64,49 @@ Known Issues:
 - **None identified at the time of submission**:
 
 """
-from operation import Operation
-from record import Record
-from creature import Pymon
-import random
+from session import GameSession
+from console import run_script
+from latency import LatencyRecorder
 
 
 class GameLoader:
-    __instance = None
-
-    def __new__(cls, *args, **kwargs):
-        """Implement singleton pattern to ensure only one game instance."""
-        if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
-        return cls.__instance
-
     def __init__(self):
-        """Initialize the game state."""
-        if not hasattr(self, '_initialized'):  # Ensure initialization only once
-            self.record = Record()
-            self._initialized = True
+        """Initialize the loader with the default game session used by the command line."""
+        self.session = GameSession()
+
+    @property
+    def record(self):
+        """Getter for the record of the default session."""
+        return self.session.record
 
-    def load_record(self, args):
+    def load_record(self, args, cache=False):
         """Load record data based on the number of command-line arguments."""
         if len(args) == 1:
-            self.record.load_data()
+            self.session.load(progress=self.report_progress, cache=cache)
         elif len(args) == 2:
-            self.record.load_data(locations_file=args[1])
+            self.session.load(locations_file=args[1], progress=self.report_progress, cache=cache)
         elif len(args) == 3:
-            self.record.load_data(locations_file=args[1], creatures_file=args[2])
+            self.session.load(
+                locations_file=args[1],
+                creatures_file=args[2],
+                progress=self.report_progress,
+                cache=cache,
+            )
         elif len(args) == 4:
-            self.record.load_data(
+            self.session.load(
                 locations_file=args[1],
                 creatures_file=args[2],
                 items_file=args[3],
+                progress=self.report_progress,
+                cache=cache,
             )
         else:
             print("Invalid number of arguments. Please provide up to 3 files.")
 
+    def report_progress(self, rows):
+        """Report how many location rows have been loaded so far."""
+        print(f"Loaded {rows} locations...")
+
     def show_help(self):
         """Display help and usage instructions for the game."""
         usage = """
@@ -109,6 +114,13 @@ class GameLoader:
 
         Options:
         --help              Show this usage information.
+        --script FILE       Replay the commands in FILE instead of reading the keyboard.
+                            Pauses are skipped and game output is discarded.
+        --output FILE       With --script, write the game output to FILE instead.
+        --latency FILE      Time every command and write the latency percentiles to FILE
+                            as JSON at exit. Menu command 16 shows them during the game.
+        --no-cache          Parse the data files instead of using the compiled world cache
+                            (locations_file.cache), and leave the cache untouched.
 
         Example:
         pymon_game                     Start the game with default settings.
@@ -123,13 +135,45 @@ class GameLoader:
             self.show_help()
             return
 
-        self.load_record(args)
-
-        pymon = Pymon(
-            "Kimimon",
-            "White and yellow Pymon with a square face",
-            random.choice(self.record.locations),
-        )
-
-        operation = Operation(pymon, self.record)
-        operation.menu()
+        args = list(args)
+        script_file = self.pop_option(args, "--script")
+        output_file = self.pop_option(args, "--output")
+        latency_file = self.pop_option(args, "--latency")
+        latency = LatencyRecorder() if latency_file else None
+        cache = "--no-cache" not in args
+        if not cache:
+            args.remove("--no-cache")
+
+        self.load_record(args, cache)
+
+        operation = self.session.begin(latency=latency)
+        try:
+            if script_file:
+                self.replay(operation, script_file, output_file)
+            else:
+                operation.menu()
+        finally:
+            self.session.close()
+            if latency:
+                latency.dump(latency_file)
+
+    def pop_option(self, args, option):
+        """Remove an option and its value from the arguments and return the value, or None."""
+        if option not in args:
+            return None
+        index = args.index(option)
+        if index + 1 >= len(args):
+            raise ValueError(f"{option} needs a file name.")
+        value = args[index + 1]
+        del args[index:index + 2]
+        return value
+
+    def replay(self, operation, script_file, output_file=None):
+        """Drive the game from a command file, discarding or capturing its output."""
+        with open(script_file, "r") as script:
+            if output_file:
+                with open(output_file, "w") as output:
+                    commands = run_script(operation, script, output)
+            else:
+                commands = run_script(operation, script)
+        print(f"Replayed {commands} lines from {script_file}")
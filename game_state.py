@@ -1,28 +1,78 @@
+import copy
 import os
 from exceptions import GameError
-from direction import Direction
+from snapshot import write_snapshot, read_snapshot, pymon_fields, pymon_dict
+from bench import Bench, BenchPymon
+from world_graph import DIRECTIONS
 
 
 class GameState:
-    __instance = None
     MAX_ENERGY = 3  # Maximum energy level for Pymons
 
-    def __new__(cls, *args, **kwargs):
-        """Implement singleton pattern to ensure only one GameState instance."""
-        if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
-        return cls.__instance
-
     def __init__(self):
-        """Initialize the game state with items, Pymons, user Pymon, and locations."""
-        if not hasattr(self, "_initialized"):  # To prevent reinitialization
-            self.items = {}  # Dictionary to store items and their locations
-            self.pymons = {}  # Dictionary to store Pymons' locations and stats
-            self.user_pymon = {"location": None, "stats": {}, "inventory": []}
-            self.bench_pymons = []  # List to store captured Pymons
-            self.locations = {}  # Dictionary to store location states
-            self.creatures = {}  # Dictionary to store creature states
-            self._initialized = True  # Mark as initialized to prevent reinitialization
+        """
+        Initialize the game state with the user Pymon and the bench.
+        The world itself is not copied into the game state: it is read from the
+        Record attached as world, which tracks the items, locations and creatures
+        that changed since its data files were loaded. Saves hold only those.
+        """
+        self.pymon = None  # Live Pymon of the player, saved straight from its attributes
+        self.user_pymon = {"location": None, "stats": {}, "inventory": []}  # Loaded form, until pymon is set
+        self.bench_pymons = Bench()  # Captured Pymons, indexed by nickname
+        self.world = None  # Record holding the authoritative world
+        self.__world_changes = None  # (items, locations, creatures) rows not applied to a world yet
+
+    def attach_pymon(self, pymon):
+        """Save the live Pymon from now on, dropping the loaded form of the user Pymon."""
+        self.pymon = pymon
+        self.user_pymon = {"location": None, "stats": {}, "inventory": []}
+
+    def world_changes(self):
+        """
+        Get the (item rows, location rows, creature rows) to save: the changed objects
+        of the attached world, or the rows loaded while no world was attached.
+        """
+        if self.__world_changes is not None:
+            return self.__world_changes
+        if self.world is not None:
+            return self.world.changes()
+        return [], [], []
+
+    def load_world_changes(self, item_rows, location_rows, creature_rows):
+        """Apply loaded world rows to the attached world, or keep them until one is attached."""
+        self.__world_changes = (item_rows, location_rows, creature_rows)
+        self.apply_world_changes()
+
+    def add_world_changes(self, item_rows=(), location_rows=(), creature_rows=()):
+        """Apply journaled world rows on top of the world, or of the rows still waiting for one."""
+        pending = self.__world_changes or ((), (), ())
+        self.__world_changes = tuple(
+            list(rows) + [tuple(row) for row in new_rows]
+            for rows, new_rows in zip(pending, (item_rows, location_rows, creature_rows))
+        )
+        self.apply_world_changes()
+
+    def apply_world_changes(self):
+        """Apply any loaded world rows to the attached world."""
+        if self.world is not None and self.__world_changes is not None:
+            self.world.apply_changes(*self.__world_changes)
+            self.__world_changes = None
+
+    def frozen(self):
+        """
+        Get a copy of the state that gameplay cannot change, for saving on another thread.
+        The changed world objects and the live Pymon are serialized into it.
+        """
+        state = GameState()
+        if self.pymon is not None:
+            fields = list(pymon_fields(self.pymon))
+            fields[-1] = list(fields[-1])  # Battle stats
+            state.user_pymon = pymon_dict(*fields)
+        else:
+            state.user_pymon = copy.deepcopy(self.user_pymon)
+        state.bench_pymons = copy.deepcopy(self.bench_pymons)
+        state.__world_changes = tuple(list(rows) for rows in self.world_changes())
+        return state
 
     def __parse_line(self, line):
         """Helper method to parse CSV lines into parts."""
@@ -48,10 +98,11 @@ class GameState:
         [Items], [Locations], [Creatures], [UserPymon], [BenchPymons].
         """
         try:
+            item_rows, location_rows, creature_rows = self.world_changes()
             with open(file_path, "w") as f:
-                self.__save_items(f)
-                self.__save_locations(f)
-                self.__save_creatures(f)
+                self.__save_items(f, item_rows)
+                self.__save_locations(f, location_rows)
+                self.__save_creatures(f, creature_rows)
                 self.__save_user_pymon(f)
                 self.__save_bench(f)
 
@@ -60,71 +111,68 @@ class GameState:
         except Exception as e:
             raise GameError(f"Failed to save game: {str(e)}")
 
-    def __save_items(self, f):
-        """Save all items to the file."""
-        f.write("[Items]\n")
-        for item_name, data in self.items.items():
-            location = data.get("location", "None")
-            is_pickable = data.get("is_pickable", True)
-            is_consumable = data.get("is_consumable", False)
-            f.write(f"{item_name}, {location}, {is_pickable}, {is_consumable}\n")
-
-    def __save_locations(self, f):
-        """Save all locations to the file."""
-        f.write("[Locations]\n")
-        for loc_name, data in self.locations.items():
-            desc = data.get("description", "")
-            doors = data.get("connections", Direction())
+    def save_snapshot(self, file_path):
+        """Save the current game state to a binary snapshot file."""
+        try:
+            write_snapshot(self, file_path)
+            print(f"Game saved successfully to {file_path}")
+
+        except Exception as e:
+            raise GameError(f"Failed to save game: {str(e)}")
 
-            # Convert Direction object to dictionary if needed
-            if isinstance(doors, Direction):
-                connections = doors.to_dict()
-            else:
-                connections = doors
+    def load_snapshot(self, file_path):
+        """Load a game state from a binary snapshot file."""
+        try:
+            if not os.path.exists(file_path):
+                raise GameError(f"Save file not found: {file_path}")
+
+            read_snapshot(self, file_path)
+            print(f"Game loaded successfully from {file_path}")
 
+        except Exception as e:
+            raise GameError(f"Failed to load game: {str(e)}")
+
+    def __save_items(self, f, item_rows):
+        """Save the items that moved to the file, with their item IDs."""
+        f.write("[Items]\n")
+        for item_id, name, location, is_pickable, is_consumable in item_rows:
+            line = f"{name}, {location}, {is_pickable}, {is_consumable}"
+            f.write(f"{line}\n" if item_id is None else f"{line}, {item_id}\n")
+
+    def __save_locations(self, f, location_rows):
+        """Save the changed locations to the file."""
+        f.write("[Locations]\n")
+        for loc_name, desc, doors in location_rows:
             # Create a list of direction-location pairs in the correct format
             connections_list = []
-            for direction in ["west", "north", "east", "south"]:
-                location = connections.get(direction, "None")
+            for direction in DIRECTIONS:
+                location = doors.get(direction) or "None"
                 connections_list.append(f"{direction} = {location}")
 
             # Join all parts with the correct delimiter format
             line = f"{loc_name}, {desc}, {', '.join(connections_list)}\n"
             f.write(line)
 
-    def __save_creatures(self, f):
-        """Save all creatures to the file."""
+    def __save_creatures(self, f, creature_rows):
+        """Save the creatures that moved to the file."""
         f.write("[Creatures]\n")
-        for creature_name, data in self.creatures.items():
-            desc = data.get("description", "")
-            loc = data.get("location", "None")
-            is_pymon = data.get("is_pymon", False)
+        for creature_name, desc, loc, is_pymon in creature_rows:
             f.write(f"{creature_name}, {desc}, {loc}, {is_pymon}\n")
 
     def __save_user_pymon(self, f):
         """Save the current user's Pymon to the file."""
         f.write("[UserPymon]\n")
-        user_pymon = self.user_pymon
-        f.write(
-            f"{user_pymon.get('nickname', '')}, {user_pymon.get('description', '')}\n"
-        )
-        f.write(f"{user_pymon.get('location', 'None')}\n")
-
-        stats = user_pymon.get("stats", {})
-        f.write(
-            f"{stats.get('energy', 3)}, {stats.get('has_immunity', False)}, {stats.get('move_count', 0)}\n"
+        nickname, desc, location, energy, has_immunity, move_count, inventory, battle_stats = pymon_fields(
+            self.pymon if self.pymon is not None else self.user_pymon
         )
+        f.write(f"{nickname}, {desc}\n")
+        f.write(f"{location}\n")
+        f.write(f"{energy}, {has_immunity}, {move_count}\n")
 
         # Save inventory items by their names only
-        inventory = []
-        for item in user_pymon.get("inventory", []):
-            if isinstance(item, str):
-                inventory.append(str(item))
-            else:
-                inventory.append(item.name)
         f.write(", ".join(inventory) + "\n")
 
-        self.__save_stats_battle(f, stats.get("battle_stats", []))
+        self.__save_stats_battle(f, battle_stats)
 
     def __save_stats_battle(self, f, battle_stats):
         """Save the battle statistics of the user's Pymon."""
@@ -138,13 +186,13 @@ class GameState:
         for pymon in self.bench_pymons:
             # Save inventory items by their names only
             inventory = []
-            for item in pymon.get("inventory", []):
+            for item in pymon.inventory:
                 if isinstance(item, str):
                     inventory.append(str(item))
                 else:
                     inventory.append(item.name)
             inventory_str = ", ".join(inventory)
-            f.write(f"{pymon['nickname']}, {pymon['description']}, {inventory_str}\n")
+            f.write(f"{pymon.nickname}, {pymon.description}, {inventory_str}\n")
 
     def load_game(self, file_path="save2024.csv"):
         """
@@ -156,16 +204,19 @@ class GameState:
 
             with open(file_path, "r") as f:
                 section = None
-                self.items = {}
-                self.locations = {}
-                self.creatures = {}
-                self.bench_pymons = []
+                item_rows, location_rows, creature_rows = [], [], []
+                self.pymon = None
+                self.bench_pymons = Bench()
                 battle_stats = []
                 user_pymon_lines = []
 
                 for line in f:
                     line = line.strip()
                     if not line:
+                        if section == "userpymon" and len(user_pymon_lines) == 3:
+                            # An empty inventory still takes its line
+                            user_pymon_lines.append(line)
+                            self.load_user_pymon(user_pymon_lines)
                         continue
 
                     if line.startswith("["):
@@ -173,11 +224,11 @@ class GameState:
                         continue
 
                     if section == "items":
-                        self.load_item_data(line)
+                        self.load_item_data(line, item_rows)
                     elif section == "locations":
-                        self.load_loc(line)
+                        self.load_loc(line, location_rows)
                     elif section == "creatures":
-                        self.load_creature(line)
+                        self.load_creature(line, creature_rows)
                     elif section == "userpymon":
                         user_pymon_lines.append(line)
                         if len(user_pymon_lines) == 4:  # We have all the basic user Pymon data
@@ -187,27 +238,60 @@ class GameState:
                     elif section == "benchpymons":
                         self.load_bench(line)
 
+            # Locations first, so items and creatures can be placed in new ones
+            self.load_world_changes(item_rows, location_rows, creature_rows)
             print(f"Game loaded successfully from {file_path}")
 
         except Exception as e:
             raise GameError(f"Failed to load game: {str(e)}")
 
-    def load_item_data(self, line):
-        """Load an item from the save file."""
+    def apply_event(self, event, data):
+        """Apply one journaled state change to the saved state."""
+        user_pymon = self.user_pymon
+        stats = user_pymon.setdefault("stats", {})
+        if event == "move":
+            user_pymon["location"] = data["location"]
+            stats["energy"] = data["energy"]
+            stats["move_count"] = data["move_count"]
+        elif event == "pick":
+            user_pymon.setdefault("inventory", []).append(data["item"])
+            self.add_world_changes(item_rows=data.get("items", ()))
+        elif event == "use":
+            stats["energy"] = data["energy"]
+            stats["has_immunity"] = data["has_immunity"]
+            user_pymon["inventory"] = data["inventory"]
+        elif event == "battle":
+            stats.setdefault("battle_stats", []).append(data["stat"])
+            stats["energy"] = data["energy"]
+            stats["has_immunity"] = data["has_immunity"]
+            user_pymon["inventory"] = data["inventory"]
+        elif event == "capture":
+            self.bench_pymons.add(
+                BenchPymon(data["nickname"], data["description"], energy=self.MAX_ENERGY)
+            )
+            self.add_world_changes(creature_rows=data.get("creatures", ()))
+        elif event == "switch":
+            selected_pymon = self.bench_pymons.swap(data["index"], BenchPymon.from_dict(user_pymon))
+            self.user_pymon = selected_pymon.to_dict()
+            self.user_pymon["location"] = user_pymon.get("location", "None")
+        else:
+            raise GameError(f"Unknown journal event: {event}")
+
+    def load_item_data(self, line, item_rows):
+        """Load an item row from the save file; saves older than item IDs have four columns."""
         if "," not in line:
             return
         parts = self.__parse_line(line)
         if len(parts) < 4:
             return
-        name, location, is_pickable, is_consumable = parts
-        self.items[name] = {
-            "location": location,
-            "is_pickable": is_pickable.lower() == "true",
-            "is_consumable": is_consumable.lower() == "true"
-        }
+        name, location, is_pickable, is_consumable = parts[:4]
+        item_id = int(parts[4]) if len(parts) > 4 and parts[4].isdigit() else None
+        item_rows.append(
+            (item_id, name, location, is_pickable.lower() == "true", is_consumable.lower() == "true")
+        )
 
-    def load_loc(self, line):
-        """Load a location from the save file."""
+    def load_loc(self, line, location_rows):
+        """Load a location row from the save file."""
         if "," not in line:
             return
         parts = self.__parse_line(line)
@@ -216,10 +300,8 @@ class GameState:
         name = parts[0]
         desc = parts[1]
 
-        # Create a new Direction object
-        doors = Direction()
-
         # Process connections
+        doors = {}
         for conn in parts[2:]:
             if "=" in conn:
                 split_conn = conn.split("=")
@@ -227,25 +309,18 @@ class GameState:
                 loc = split_conn[1].strip()
 
                 if loc.lower() != "none":
-                    doors.set_direction(loc, direction)
-        self.locations[name] = {
-            "description": desc,
-            "connections": doors,
-        }
+                    doors[direction] = loc
+        location_rows.append((name, desc, doors))
 
-    def load_creature(self, line):
-        """Load a creature from the save file."""
+    def load_creature(self, line, creature_rows):
+        """Load a creature row from the save file."""
         if "," not in line:
             return
         parts = self.__parse_line(line)
         if len(parts) < 4:
             return
         name, desc, loc, is_pymon = parts
-        self.creatures[name] = {
-            "description": desc,
-            "location": loc,
-            "is_pymon": is_pymon.lower() == "true",
-        }
+        creature_rows.append((name, desc, loc, is_pymon.lower() == "true"))
 
     def load_user_pymon(self, lines):
         """Load the user's Pymon data from the save file."""
@@ -307,8 +382,4 @@ class GameState:
             return
         nickname, desc, inventory = parts
         inventory_items = self.__parse_inventory(inventory)
-        self.bench_pymons.append({
-            "nickname": nickname,
-            "description": desc,
-            "inventory": inventory_items,
-        })
+        self.bench_pymons.add(BenchPymon(nickname, desc, inventory_items))
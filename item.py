@@ -69,6 +69,8 @@ ENERGY_PLUS_RATE = 1
 
 
 class Item:
+    __slots__ = ("__name", "__desc", "__is_pickable", "__is_consumable", "__effect", "__item_id")
+
     def __init__(self, name, desc, is_pickable=True, is_consumable=False, effect=None):
         """Initialize the Item object."""
         self.__name = name
@@ -76,6 +78,7 @@ class Item:
         self.__is_pickable = is_pickable
         self.__is_consumable = is_consumable
         self.__effect = effect
+        self.__item_id = None  # Position in the Record's item list, stable across launches
 
     @property
     def name(self):
@@ -132,3 +135,13 @@ class Item:
     def effect(self, new_effect):
         """Setter for effect"""
         self.__effect = new_effect
+
+    @property
+    def item_id(self):
+        """Getter for the item ID"""
+        return self.__item_id
+
+    @item_id.setter
+    def item_id(self, new_item_id):
+        """Setter for the item ID"""
+        self.__item_id = new_item_id
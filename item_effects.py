@@ -0,0 +1,189 @@
+import os
+from exceptions import GameError
+from item import Item, MAX_ENERGY
+
+EFFECT_SEPARATOR = ";"  # Separates the parts of an effect, since columns are comma separated
+# Effects of the original items, used when items.csv has no effect column or leaves it empty
+LEGACY_EFFECTS = {
+    "apple": "energy+1",
+    "potion": "immunity",
+    "magic potion": "immunity",
+    "binocular": "reveal",
+    "tree": "decoration",
+}
+
+
+class ItemEffect:
+    """
+    What using an item does, compiled from an effect spec such as "energy+1",
+    "immunity", "reveal" or "decoration". Parts can be combined with ";".
+    """
+
+    def __init__(self, energy_delta=0, immunity=False, reveal=False, decoration=False):
+        """Initialize the effect from its parts."""
+        self.__energy_delta = energy_delta
+        self.__immunity = immunity
+        self.__reveal = reveal
+        self.__decoration = decoration
+
+    @classmethod
+    def compile(cls, spec):
+        """Compile an effect spec. Raises GameError for an unknown part."""
+        energy_delta, immunity, reveal, decoration = 0, False, False, False
+        for part in spec.lower().split(EFFECT_SEPARATOR):
+            part = part.strip()
+            if not part or part == "none":
+                continue
+            if part.startswith("energy"):
+                try:
+                    energy_delta += int(part[len("energy"):])
+                except ValueError:
+                    raise GameError(f"Invalid energy effect: {part}")
+            elif part == "immunity":
+                immunity = True
+            elif part == "reveal":
+                reveal = True
+            elif part == "decoration":
+                decoration = True
+            else:
+                raise GameError(f"Unknown item effect: {part}")
+        return cls(energy_delta, immunity, reveal, decoration)
+
+    @property
+    def energy_delta(self):
+        """Getter for the energy change"""
+        return self.__energy_delta
+
+    @property
+    def immunity(self):
+        """Getter for whether the effect gives immunity"""
+        return self.__immunity
+
+    @property
+    def reveal(self):
+        """Getter for whether the effect reveals locations"""
+        return self.__reveal
+
+    @property
+    def decoration(self):
+        """Getter for whether the item is only decoration"""
+        return self.__decoration
+
+    def apply(self, pymon, item):
+        """Use the item on a Pymon."""
+        if self.__decoration:
+            print(f"{item.name} is just for decoration and cannot be used.")
+            return
+
+        used = False
+        if self.__energy_delta:
+            energy = max(0, min(MAX_ENERGY, pymon.energy + self.__energy_delta))
+            if energy != pymon.energy:
+                pymon.energy = energy
+                used = True
+                print(f"{pymon.nickname} used the {item.name}. Energy: {pymon.energy}/{MAX_ENERGY}")
+            elif self.__energy_delta > 0:
+                print(f"{pymon.nickname} is already at full energy.")
+            else:
+                print(f"{pymon.nickname} has no energy to lose.")
+
+        if self.__immunity:
+            if not pymon.has_immunity:
+                pymon.has_immunity = True
+                print(f"{pymon.nickname} used the {item.name} and is now immune for one battle.")
+            else:
+                print(f"{pymon.nickname} already has immunity active. {item.name} cannot be used.")
+
+        if self.__reveal:
+            pymon.use_binocular()
+
+        # An immunity item is used up when the immunity protects the Pymon in battle
+        if used and item.is_consumable and not self.__immunity and item in pymon.inventory:
+            pymon.inventory.remove(item)
+
+
+class ItemCatalog:
+    """
+    The kinds of items declared in items.csv.
+    Every item name gets an ID, and the effect spec of each kind is compiled once
+    into a dispatch table indexed by that ID. Items created from the catalog carry
+    the entry of their kind, so Pymon.use_item applies item.effect without looking
+    anything up by name.
+    """
+
+    def __init__(self):
+        """Initialize an empty catalog."""
+        self.__ids = {}  # item name -> ID
+        self.__kinds = []  # ID -> (name, description, pickable, consumable, effect spec)
+        self.__effects = []  # ID -> ItemEffect, or None for an item that cannot be used
+        self.__compiled = {}  # effect spec -> ItemEffect, shared between kinds
+
+    @staticmethod
+    def __parse_flag(value):
+        """Parse a yes/no column."""
+        return value.strip().lower() in ("yes", "true")
+
+    def rows(self, file_path):
+        """
+        Stream an items CSV file, adding the kind of every row to the catalog, and
+        yield (item name, location name) for each row. Columns are found by their
+        header names; the location is None when the file has no location column or
+        the row leaves it empty.
+        """
+        if not os.path.exists(file_path):
+            raise GameError(f"Items file not found: {file_path}")
+        with open(file_path, "r") as f:
+            header = [part.strip().lower() for part in f.readline().split(",")]
+            columns = {name: i for i, name in enumerate(header)}
+            for column in ("name", "description", "pickable", "consumable"):
+                if column not in columns:
+                    raise GameError(f"Items file is missing the {column} column: {file_path}")
+            name_col, desc_col = columns["name"], columns["description"]
+            pickable_col, consumable_col = columns["pickable"], columns["consumable"]
+            effect_col, location_col = columns.get("effect"), columns.get("location")
+            for line in f:
+                parts = [part.strip() for part in line.split(",")]
+                if len(parts) < len(header) or not parts[name_col]:
+                    continue
+                name = parts[name_col]
+                self.add_kind(
+                    name,
+                    parts[desc_col],
+                    self.__parse_flag(parts[pickable_col]),
+                    self.__parse_flag(parts[consumable_col]),
+                    parts[effect_col] if effect_col is not None else "",
+                )
+                location = parts[location_col] if location_col is not None else ""
+                yield name, location if location and location != "None" else None
+
+    def add_kind(self, name, desc, is_pickable=True, is_consumable=False, spec=""):
+        """Add or replace an item kind and compile its effect. Returns the item ID."""
+        if not spec:
+            spec = LEGACY_EFFECTS.get(name.lower(), "")
+        effect = None
+        if spec:
+            effect = self.__compiled.get(spec)
+            if effect is None:
+                effect = self.__compiled[spec] = ItemEffect.compile(spec)
+
+        item_id = self.__ids.get(name)
+        if item_id is None:
+            item_id = len(self.__kinds)
+            self.__ids[name] = item_id
+            self.__kinds.append(None)
+            self.__effects.append(None)
+        self.__kinds[item_id] = (name, desc, is_pickable, is_consumable, spec)
+        self.__effects[item_id] = effect
+        return item_id
+
+    def create(self, name):
+        """Create an Item of a kind in the catalog, carrying its compiled effect."""
+        item_id = self.__ids.get(name)
+        if item_id is None:
+            raise GameError(f"Unknown item: {name}")
+        name, desc, is_pickable, is_consumable, _ = self.__kinds[item_id]
+        return Item(name, desc, is_pickable, is_consumable, self.__effects[item_id])
+
+    def kinds(self):
+        """Get every kind as (name, description, pickable, consumable, effect spec), in ID order."""
+        return list(self.__kinds)
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+from exceptions import GameError
+from snapshot import SNAPSHOT_EXT, write_snapshot, read_snapshot
+
+JOURNAL_EXT = ".pyjournal"  # Save files with this extension use the journaled save mode
+COMPACT_EVERY = 500  # Journal records between two compactions
+
+
+class GameJournal:
+    """
+    Journaled save for a GameState.
+    The journal file holds one small JSON record per state change (move, pick, use,
+    battle, capture, switch), each with an increasing sequence number. A binary
+    snapshot next to it holds the full state up to a sequence number; compaction
+    writes a new snapshot in the background and drops the records it covers.
+    Loading reads the snapshot and replays the newer records.
+    """
+
+    def __init__(self, file_path):
+        """Initialize the journal for a save file path."""
+        self.__file_path = file_path
+        self.__snapshot_path = file_path + SNAPSHOT_EXT
+        self.__seq = 0
+        self.__since_compaction = 0
+        self.__file = None
+        self.__lock = threading.Lock()
+        self.__compactor = None
+
+    @property
+    def file_path(self):
+        """Getter for the journal file path."""
+        return self.__file_path
+
+    @property
+    def seq(self):
+        """Getter for the sequence number of the last record."""
+        return self.__seq
+
+    def start(self, game_state):
+        """Start a fresh journal from the full current state."""
+        self.close()
+        write_snapshot(game_state, self.__snapshot_path, journal_seq=self.__seq)
+        self.__file = open(self.__file_path, "w")
+        self.__since_compaction = 0
+
+    def load(self, game_state):
+        """Load the newest snapshot and replay the journal records written after it."""
+        self.close()
+        if not os.path.exists(self.__snapshot_path):
+            raise GameError(f"Save file not found: {self.__snapshot_path}")
+        snapshot_seq = read_snapshot(game_state, self.__snapshot_path)
+        self.__seq = snapshot_seq
+        self.__since_compaction = 0
+        for seq, event, data in self.__read_records():
+            if seq > snapshot_seq:
+                game_state.apply_event(event, data)
+                self.__seq = seq
+                self.__since_compaction += 1
+        self.__file = open(self.__file_path, "a")
+
+    def __read_records(self):
+        """Read all complete records of the journal file."""
+        records = []
+        if not os.path.exists(self.__file_path):
+            return records
+        with open(self.__file_path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Ignore a record cut short by a crash
+                record = json.loads(line)
+                records.append((record["seq"], record["event"], record["data"]))
+        return records
+
+    def append(self, event, data):
+        """Append one state change. Returns True when the journal is due for compaction."""
+        with self.__lock:
+            if self.__file is None:
+                raise GameError("Journal is not open.")
+            self.__seq += 1
+            self.__file.write(json.dumps({"seq": self.__seq, "event": event, "data": data}) + "\n")
+            self.__file.flush()
+            self.__since_compaction += 1
+            return self.__since_compaction >= COMPACT_EVERY
+
+    def flush(self):
+        """Make sure every appended record has reached the disk."""
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+
+    def compact(self, game_state):
+        """Fold the journal into a new snapshot on a background thread."""
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        # Serialize what gameplay changes before handing the state to the thread
+        state = game_state.frozen()
+        self.__since_compaction = 0
+        self.__compactor = threading.Thread(
+            target=self.__compact, args=(state, self.__seq), daemon=True
+        )
+        self.__compactor.start()
+
+    def __compact(self, state, seq):
+        """Write the snapshot, then rewrite the journal without the records it covers."""
+        write_snapshot(state, self.__snapshot_path, journal_seq=seq)
+        with self.__lock:
+            if self.__file is None:
+                return
+            self.__file.close()
+            tmp_path = self.__file_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                for record_seq, event, data in self.__read_records():
+                    if record_seq > seq:
+                        f.write(json.dumps({"seq": record_seq, "event": event, "data": data}) + "\n")
+            os.replace(tmp_path, self.__file_path)
+            self.__file = open(self.__file_path, "a")
+
+    def close(self):
+        """Wait for a running compaction and close the journal file."""
+        if self.__compactor is not None:
+            self.__compactor.join()
+            self.__compactor = None
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
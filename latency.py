@@ -0,0 +1,112 @@
+import json
+from array import array
+
+SUB_BUCKET_BITS = 3  # 8 buckets per power of two, so a bucket is at most 12.5% wide
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKETS = 64 << SUB_BUCKET_BITS  # Enough for any 64-bit nanosecond duration
+PERCENTILES = (50, 95, 99)
+NS_PER_MS = 1000000
+
+
+def bucket_of(ns):
+    """Get the histogram bucket of a duration in nanoseconds."""
+    if ns < SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - 1 - SUB_BUCKET_BITS
+    return ((shift + 1) << SUB_BUCKET_BITS) + (ns >> shift) - SUB_BUCKETS
+
+
+def bucket_range(bucket):
+    """Get the lowest and the first excluded duration of a bucket, in nanoseconds."""
+    if bucket < SUB_BUCKETS:
+        return bucket, bucket + 1
+    shift = (bucket >> SUB_BUCKET_BITS) - 1
+    mantissa = (bucket & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of durations with logarithmic buckets.
+    Recording is O(1) and the memory use does not grow with the number of samples;
+    percentiles are accurate to the width of a bucket.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.__counts = array("Q", bytes(8 * BUCKETS))
+        self.__count = 0
+        self.__total = 0
+        self.__max = 0
+
+    @property
+    def count(self):
+        """Getter for the number of recorded durations."""
+        return self.__count
+
+    def record(self, ns):
+        """Record one duration in nanoseconds."""
+        self.__counts[bucket_of(ns)] += 1
+        self.__count += 1
+        self.__total += ns
+        if ns > self.__max:
+            self.__max = ns
+
+    def percentile(self, percent):
+        """Get a percentile in nanoseconds, as the middle of the bucket it falls in."""
+        if not self.__count:
+            return 0
+        rank = max(1, -(-self.__count * percent // 100))  # Ceiling without floats
+        seen = 0
+        for bucket, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                low, high = bucket_range(bucket)
+                return min((low + high - 1) // 2, self.__max)
+        return self.__max
+
+    def summary(self):
+        """Get the count, mean, percentiles and maximum, in milliseconds."""
+        result = {"count": self.__count}
+        result["mean_ms"] = self.__total / self.__count / NS_PER_MS if self.__count else 0.0
+        for percent in PERCENTILES:
+            result[f"p{percent}_ms"] = self.percentile(percent) / NS_PER_MS
+        result["max_ms"] = self.__max / NS_PER_MS
+        return result
+
+
+class LatencyRecorder:
+    """Latency histograms by name, for commands and the game paths they run."""
+
+    def __init__(self):
+        """Initialize the recorder without any histograms."""
+        self.__histograms = {}
+
+    def record(self, name, ns):
+        """Record a duration in nanoseconds under a name."""
+        histogram = self.__histograms.get(name)
+        if histogram is None:
+            histogram = self.__histograms[name] = LatencyHistogram()
+        histogram.record(ns)
+
+    def summary(self):
+        """Get the summary of every histogram, by name."""
+        return {name: histogram.summary() for name, histogram in sorted(self.__histograms.items())}
+
+    def report(self):
+        """Print a table of the recorded latencies."""
+        summary = self.summary()
+        if not summary:
+            print("No latencies recorded yet.")
+            return
+        print(f"\n{'name':<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, stats in summary.items():
+            print(
+                f"{name:<24}{stats['count']:>8}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+                f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['max_ms']:>10.3f}"
+            )
+
+    def dump(self, file_path):
+        """Write the summary as JSON."""
+        with open(file_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
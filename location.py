@@ -1,16 +1,22 @@
 from direction import Direction
+from renderer import DEFAULT_RENDERER
 
 class Location:
     """
     Location object with name, description
     """
+    __slots__ = ("__name", "__desc", "__doors", "__creatures", "__items", "__item_names", "__graph", "__loc_id")
+
     def __init__(self, name, desc):
         """Initialize the Location object."""
         self.__name = name
         self.__desc = desc
-        self.__doors = Direction()
-        self.__creatures = []
-        self.__items = []
+        self.__doors = None  # Direction, created on first use until attached to a graph
+        self.__creatures = None  # Lists are created on first use to keep empty locations small
+        self.__items = None
+        self.__item_names = None  # lowercase item name -> items with that name, kept with __items
+        self.__graph = None  # WorldGraph holding the doors once the location is attached
+        self.__loc_id = None
 
     @property
     def name(self):
@@ -19,6 +25,9 @@ class Location:
 
     @name.setter
     def name(self, new_name):
+        """Setter for name, which also renames the location in its world graph"""
+        if self.__graph is not None:
+            self.__graph.rename(self.__loc_id, new_name)
         self.__name = new_name
 
     @property
@@ -31,24 +40,53 @@ class Location:
         """Setter for Description"""
         self.__desc = new_description
 
+    @property
+    def loc_id(self):
+        """Getter for the ID of the location in its world graph"""
+        return self.__loc_id
+
     @property
     def doors(self):
         """Getter for Doors"""
+        if self.__graph is not None:
+            return self.__graph.directions(self.__loc_id)
+        if self.__doors is None:
+            self.__doors = Direction()
         return self.__doors
 
     @doors.setter
     def doors(self, new_doors):
         """Setter for Doors"""
-        if isinstance(new_doors, dict):
-            self.__doors.from_dict(new_doors)
-        elif isinstance(new_doors, Direction):
-            self.__doors = new_doors
-        else:
+        if not isinstance(new_doors, (dict, Direction)):
             raise ValueError("Doors must be a Direction object or dictionary")
+        if self.__graph is not None:
+            self.__graph.set_doors(self.__loc_id, new_doors)
+        elif isinstance(new_doors, dict):
+            self.doors.from_dict(new_doors)
+        else:
+            self.__doors = new_doors
+
+    def attach(self, graph, loc_id):
+        """Attach the location to a world graph, which then stores its doors."""
+        doors = self.__doors
+        self.__graph = graph
+        self.__loc_id = loc_id
+        self.__doors = None
+        if doors is not None:
+            graph.set_doors(loc_id, doors)
+
+    def get_door(self, direction):
+        """Get the location behind the door in a direction, or None."""
+        if self.__graph is not None:
+            return self.__graph.neighbour(self.__loc_id, direction)
+        door = self.doors.to_dict().get(direction)
+        return door if isinstance(door, Location) else None
 
     @property
     def creatures(self):
         """Getter for the creatures present in the location."""
+        if self.__creatures is None:
+            self.__creatures = []
         return self.__creatures
 
     @creatures.setter
@@ -62,13 +100,18 @@ class Location:
     @property
     def items(self):
         """Getter for the items present in the location."""
+        if self.__items is None:
+            self.__items = []
         return self.__items
 
     @items.setter
     def items(self, new_items):
         """Setter for the items present in the location."""
         if isinstance(new_items, list):
-            self.items = new_items
+            self.__items = []
+            self.__item_names = None
+            for item in new_items:
+                self.add_item(item)
         else:
             raise ValueError("Items must be a list")
 
@@ -76,35 +119,59 @@ class Location:
         """Add a creature to the location."""
         self.creatures.append(creature)
 
+    def remove_creature(self, creature):
+        """Remove a creature from the location. Returns False if it is not here."""
+        if not self.__creatures or creature not in self.__creatures:
+            return False
+        self.__creatures.remove(creature)
+        return True
+
     def add_item(self, item):
         """Add an item to the location."""
         self.items.append(item)
-
-    def inspect(self):
+        if self.__item_names is None:
+            self.__item_names = {}
+        self.__item_names.setdefault(item.name.lower(), []).append(item)
+
+    def remove_item(self, item):
+        """Remove an item from the location. Returns False if it is not here."""
+        same_name = self.__item_names.get(item.name.lower()) if self.__item_names else None
+        if not same_name or item not in same_name:
+            return False
+        same_name.remove(item)
+        if not same_name:
+            del self.__item_names[item.name.lower()]
+        self.__items.remove(item)
+        return True
+
+    def inspect(self, renderer=DEFAULT_RENDERER):
         """Inspect the location and display its details."""
-        print(f"You are at {self.__name}. {self.__desc}")
-        if self.creatures:
-            for creature in self.creatures:
-                print(f"Creature present: {creature.nickname} - {creature.desc}")
-        else:
-            print("No creatures here.")
-        if self.items:
-            for item in self.items:
-                print(f"Item present: {item.name} - {item.desc}")
-        else:
-            print("No items here.")
+        with renderer.screen() as screen:
+            screen.line("You are at {}. {}", self.__name, self.__desc)
+            if self.__creatures:
+                screen.lines(
+                    "Creature present: {} - {}",
+                    ((creature.nickname, creature.desc) for creature in self.__creatures),
+                )
+            else:
+                screen.line("No creatures here.")
+            if self.__items:
+                screen.lines("Item present: {} - {}", ((item.name, item.desc) for item in self.__items))
+            else:
+                screen.line("No items here.")
 
     def get_item(self, item_name):
-        """Get an item from the location."""
-        item = None
-        for i in self.items:
-            if i.name == item_name:
-                item = i
-                break
-        return item
-
-    def validate_new_loc(self, new_name, new_doors, existing_loc):
-        """Validate a new location against existing ones."""
+        """Get an item from the location by name, ignoring case."""
+        if not self.__item_names:
+            return None
+        same_name = self.__item_names.get(item_name.lower())
+        return same_name[0] if same_name else None
+
+    def validate_new_loc(self, new_name, new_doors, record):
+        """
+        Validate a new location against the existing ones in a Record.
+        Every rule is a hash lookup on the record's indexes.
+        """
         # Check for blank fields
         if not new_name:
             raise ValueError("Location name must be specified.")
@@ -125,31 +192,16 @@ class Location:
             raise ValueError("At least one direction must be specified.")
 
         # Check for unique location name
-        name_exists = False
-        for loc in existing_loc:
-            if loc.name == new_name:
-                name_exists = True
-                break
-
-        if name_exists:
+        if record.has_location(new_name):
             raise ValueError("Location name must be unique.")
 
         # Check for similar locations
-        for loc in existing_loc:
-            if isinstance(loc.doors, Direction):
-                if loc.doors == new_doors:
-                    raise ValueError("A similar location with the same connections already exists.")
-            else:
-                if loc.doors == doors_dict:
-                    raise ValueError("A similar location with the same connections already exists.")
+        if record.has_similar_location(doors_dict):
+            raise ValueError("A similar location with the same connections already exists.")
 
         # Check if all specified directions exist
-        existing_loc_names = []
-        for loc in existing_loc:
-            existing_loc_names.append(loc.name)
-
         for direction, loc_name in doors_dict.items():
-            if loc_name and loc_name not in existing_loc_names:
+            if loc_name and not record.has_location(loc_name):
                 raise ValueError(f"Location in direction {direction} does not exist: {loc_name}")
 
     def check_connection(self):
@@ -0,0 +1,197 @@
+import os
+import struct
+from direction import Direction
+from world_graph import DIRECTIONS
+
+ROW_SLACK = 32  # Spare spaces written after a row so later door patches fit in place
+INTENT = struct.Struct("<QI")  # file size before the flush, number of in-place writes
+WRITE = struct.Struct("<QI")  # offset, length of one in-place write
+APPEND = struct.Struct("<Q")  # length of the data appended at the end of the file
+
+
+class LocationStore:
+    """
+    Incremental writer for locations.csv.
+    The byte offset of every row is indexed once, so adding a location only touches
+    the rows of its neighbours: a patched row is rewritten in place when it fits
+    (rows are padded with spaces), otherwise it is blanked and appended again.
+    Queued edits are written by flush() as one batch. The batch is first recorded
+    in an intent file, which is replayed on the next open if a flush was interrupted.
+    """
+
+    def __init__(self, file_path):
+        """Open the store for a locations file, finishing any interrupted flush."""
+        self.__file_path = file_path
+        self.__intent_path = file_path + ".pending"
+        self.__rows = None  # location name -> (offset, length) of its row, without the newline
+        self.__new_rows = {}  # location name -> door dict of locations to append
+        self.__new_descs = {}  # location name -> description of locations to append
+        self.__patches = {}  # location name -> {direction: new door name}
+        if os.path.exists(self.__intent_path):
+            self.__replay_intent()
+
+    @property
+    def file_path(self):
+        """Getter for the locations file path."""
+        return self.__file_path
+
+    def __index_rows(self):
+        """Index the byte offset of every row in one pass over the file."""
+        self.__rows = {}
+        if not os.path.exists(self.__file_path):
+            return
+        with open(self.__file_path, "rb") as f:
+            offset = len(f.readline())  # Skip header line
+            for line in f:
+                row = line.rstrip(b"\r\n")
+                name = row.split(b",", 1)[0].strip()
+                if name and row.count(b",") >= 5:
+                    self.__rows[name.decode("utf-8")] = (offset, len(row))
+                offset += len(line)
+
+    @staticmethod
+    def parse_row(row):
+        """Parse a row into name, description and a door dict, accepting 'west = X' doors too."""
+        parts = [part.strip() for part in row.split(",")]
+        doors = {}
+        for direction, door in zip(DIRECTIONS, parts[2:6]):
+            if "=" in door:
+                door = door.split("=", 1)[1].strip()
+            doors[direction] = None if door in ("", "None") else door
+        return parts[0], parts[1], doors
+
+    @staticmethod
+    def format_row(name, desc, doors):
+        """Format a location row the way the loader reads it."""
+        names = []
+        for direction in DIRECTIONS:
+            door = doors.get(direction)
+            if door is not None and not isinstance(door, str):
+                door = door.name
+            names.append(door if door else "None")
+        return f"{name}, {desc}, " + ", ".join(names)
+
+    def add_location(self, location):
+        """Queue a new location row and the opposite-door patches of its neighbours."""
+        doors = {}
+        for direction, door in location.doors.to_dict().items():
+            doors[direction] = door.name if door is not None and not isinstance(door, str) else door
+        self.__new_rows[location.name] = doors
+        self.__new_descs[location.name] = location.desc
+        for direction, door in doors.items():
+            if door and door != "None":
+                self.patch_door(door, Direction.get_opposite(direction), location.name)
+
+    def patch_door(self, loc_name, direction, door_name):
+        """Queue a change of one door of a location."""
+        if loc_name in self.__new_rows:
+            self.__new_rows[loc_name][direction] = door_name
+        else:
+            self.__patches.setdefault(loc_name, {})[direction] = door_name
+
+    def flush(self):
+        """Write all queued edits as one batch."""
+        if not self.__new_rows and not self.__patches:
+            return
+        if self.__rows is None:
+            self.__index_rows()
+
+        with open(self.__file_path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size:
+                f.seek(size - 1)
+                needs_newline = f.read(1) != b"\n"
+            else:
+                needs_newline = False
+
+            writes = []  # (offset, bytes) written in place
+            appended = bytearray(b"\n" if needs_newline else b"")
+            moved = {}  # location name -> (offset in appended data, length)
+
+            for name, changes in self.__patches.items():
+                position = self.__rows.get(name)
+                if position is None:
+                    continue  # The neighbour is not in this file
+                offset, length = position
+                f.seek(offset)
+                loc_name, desc, doors = self.parse_row(f.read(length).decode("utf-8"))
+                doors.update(changes)
+                row = self.format_row(loc_name, desc, doors).encode("utf-8")
+                if len(row) <= length:
+                    writes.append((offset, row.ljust(length)))
+                else:
+                    writes.append((offset, b" " * length))
+                    moved[name] = self.__append_row(appended, row)
+
+            for name, doors in self.__new_rows.items():
+                row = self.format_row(name, self.__new_descs[name], doors).encode("utf-8")
+                moved[name] = self.__append_row(appended, row)
+
+            self.__write_intent(size, writes, appended)
+            self.__apply(f, size, writes, appended)
+
+        os.remove(self.__intent_path)
+        for name, (offset, length) in moved.items():
+            self.__rows[name] = (size + offset, length)
+        self.__new_rows = {}
+        self.__new_descs = {}
+        self.__patches = {}
+
+    @staticmethod
+    def __append_row(appended, row):
+        """Add a padded row to the data to append and return its position in that data."""
+        offset = len(appended)
+        padded = row + b" " * ROW_SLACK
+        appended += padded + b"\n"
+        return offset, len(padded)
+
+    def __write_intent(self, size, writes, appended):
+        """Record a batch durably before it is applied."""
+        with open(self.__intent_path, "wb") as f:
+            f.write(INTENT.pack(size, len(writes)))
+            for offset, data in writes:
+                f.write(WRITE.pack(offset, len(data)))
+                f.write(data)
+            f.write(APPEND.pack(len(appended)))
+            f.write(appended)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def __apply(f, size, writes, appended):
+        """Apply a batch to the open locations file. Safe to repeat."""
+        for offset, data in writes:
+            f.seek(offset)
+            f.write(data)
+        f.truncate(size)
+        f.seek(size)
+        f.write(appended)
+        f.flush()
+        os.fsync(f.fileno())
+
+    def __replay_intent(self):
+        """Finish a flush that was interrupted after its intent was recorded."""
+        with open(self.__intent_path, "rb") as f:
+            data = f.read()
+        try:
+            size, count = INTENT.unpack_from(data, 0)
+            offset = INTENT.size
+            writes = []
+            for _ in range(count):
+                write_offset, length = WRITE.unpack_from(data, offset)
+                offset += WRITE.size
+                writes.append((write_offset, data[offset:offset + length]))
+                offset += length
+            (length,) = APPEND.unpack_from(data, offset)
+            offset += APPEND.size
+            appended = data[offset:offset + length]
+            if len(appended) != length:
+                raise struct.error("truncated intent")
+        except struct.error:
+            # The intent itself was not fully written, so the file was never touched
+            os.remove(self.__intent_path)
+            return
+        with open(self.__file_path, "r+b") as f:
+            self.__apply(f, size, writes, appended)
+        os.remove(self.__intent_path)
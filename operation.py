@@ -6,33 +6,65 @@ Student ID: s3878174
 Highest Part Attempted: HD
 """
 import sys
+import time
 
 # Import the GameState class
 from game_state import GameState
+from bench import BenchPymon
+from battle_log import query_battles
 from location import Location
 from creature import Pymon, Animal
 from exceptions import InvalidDirectionException, AnimalCaptureError, GameError
 from item import MAX_ENERGY
 from direction import Direction
+from snapshot import SNAPSHOT_EXT
+from journal import GameJournal, JOURNAL_EXT
+from location_store import LocationStore
+from creature_registry import CreatureRegistry
+from console import Console
+from renderer import DEFAULT_RENDERER
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# Names of the menu commands, used for their latency histograms
+COMMAND_NAMES = {
+    1: "inspect_pymon",
+    2: "inspect_location",
+    3: "move",
+    4: "pick_item",
+    5: "view_inventory",
+    6: "challenge",
+    7: "generate_stats",
+    8: "save_game",
+    9: "load_game",
+    10: "add_location",
+    11: "add_creature",
+    12: "display_setup",
+    13: "exit",
+    14: "plan_route",
+    15: "query_battles",
+    16: "latency_stats",
+}
 
 
 # Operation class
 class Operation:
-    __instance = None
-
-    def __new__(cls, *args, **kwargs):
-        """Implement singleton pattern to ensure only one Operation instance."""
-        if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
-        return cls.__instance
-
-    def __init__(self, pymon, record):
-        """Initialize Operation with a Pymon and game record."""
-        if not hasattr(self, "__initialized"):  # To prevent reinitialization
-            self.__pymon = pymon
-            self.__record = record
-            self.__game_state = GameState()
-            self.__initialized = True  # Mark as initialized to avoid reinitialization
+    def __init__(self, pymon, record, console=None, latency=None, renderer=None):
+        """
+        Initialize Operation with a Pymon, the game record it plays on and the console
+        to read input from. Pass a LatencyRecorder to time every command, and a
+        Renderer to write screens somewhere other than stdout.
+        """
+        self.__console = console if console is not None else Console()
+        self.__latency = latency  # LatencyRecorder, or None when timing is off
+        self.__renderer = renderer if renderer is not None else DEFAULT_RENDERER
+        self.__pymon = pymon
+        pymon.console = self.__console
+        pymon.renderer = self.__renderer
+        self.__record = record
+        self.__game_state = record.game_state
+        self.__journal = None  # GameJournal while journaled saving is active
+        self.__location_store = None  # LocationStore, opened on the first custom location
+        self.__creature_registry = None  # CreatureRegistry, opened on the first custom creature
 
     @property
     def pymon(self):
@@ -41,8 +73,30 @@ class Operation:
 
     @pymon.setter
     def pymon(self, new_pymon):
+        new_pymon.console = self.__console
+        new_pymon.renderer = self.__renderer
         self.__pymon = new_pymon
 
+    @property
+    def console(self):
+        """Getter for the console input is read from."""
+        return self.__console
+
+    @console.setter
+    def console(self, new_console):
+        self.__console = new_console
+        self.__pymon.console = new_console
+
+    @property
+    def renderer(self):
+        """Getter for the renderer screens are written with."""
+        return self.__renderer
+
+    @renderer.setter
+    def renderer(self, new_renderer):
+        self.__renderer = new_renderer
+        self.__pymon.renderer = new_renderer
+
     @property
     def record(self):
         """Getter for the game record."""
@@ -62,6 +116,22 @@ class Operation:
         """Setter for the game state."""
         self.__game_state = new_game_state
 
+    def log_event(self, event, data):
+        """Append a state change to the journal when journaled saving is active."""
+        if self.__journal is None:
+            return
+        if self.__journal.append(event, data):
+            self.record.sync_user_pymon(self.pymon)
+            self.__journal.compact(self.game_state)
+
+    def __pymon_state(self):
+        """Get the energy, immunity and inventory names of the active Pymon."""
+        return {
+            "energy": self.pymon.energy,
+            "has_immunity": self.pymon.has_immunity,
+            "inventory": [item.name for item in self.pymon.inventory],
+        }
+
     def display_setup(self):
         """Display the current setup of the game world."""
         print("\n###### Game World Setup ##########\n")
@@ -105,15 +175,48 @@ class Operation:
         print("11) Add custom creature")
         print("12) Display setup")
         print("13) Exit the program")
+        print("14) Plan route")
+        print("15) Query battle history")
+        print("16) Show latency stats")
+
+    @property
+    def latency(self):
+        """Getter for the latency recorder, None when timing is off."""
+        return self.__latency
 
     def command_multiplexer(self, command):
-        """Multiplex the command to the corresponding function."""
+        """Multiplex the command to the corresponding function, timing it when latency recording is on."""
+        if self.__latency is None:
+            self.dispatch_command(command)
+            return
+        start = time.perf_counter_ns()
+        try:
+            self.dispatch_command(command)
+        finally:
+            try:
+                name = COMMAND_NAMES.get(int(command), "invalid")
+            except ValueError:
+                name = "invalid"
+            self.__latency.record(f"command.{name}", time.perf_counter_ns() - start)
+
+    def timed(self, name, function, *args, **kwargs):
+        """Call a function, recording its latency under a name when latency recording is on."""
+        if self.__latency is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.__latency.record(name, time.perf_counter_ns() - start)
+
+    def dispatch_command(self, command):
+        """Run the function of a menu command."""
         try:
             user_command = int(command)
             if user_command == 1:
                 self.inspect_pymon_submenu()
             elif user_command == 2:
-                self.pymon.loc.inspect()
+                self.pymon.loc.inspect(self.__renderer)
             elif user_command == 3:
                 self.move_pymon()
             elif user_command == 4:
@@ -136,6 +239,12 @@ class Operation:
                 self.display_setup()
             elif user_command == 13:
                 self.quit()
+            elif user_command == 14:
+                self.plan_route()
+            elif user_command == 15:
+                self.query_battle_history()
+            elif user_command == 16:
+                self.show_latency_stats()
             else:
                 print("Invalid command. Please enter a valid number.")
         except ValueError:
@@ -146,7 +255,7 @@ class Operation:
         print("\n")
         print("1.1) Inspect current Pymon")
         print("1.2) Switch active Pymon")
-        sub_command = input("Enter your sub-command: ")
+        sub_command = self.console.read("Enter your sub-command: ")
         if sub_command == "1.1":
             self.pymon.inspect()
         elif sub_command == "1.2":
@@ -157,9 +266,17 @@ class Operation:
 
     def move_pymon(self):
         """Move Pymon to a new location."""
-        direction = input("Moving to which direction?: ").lower()
+        direction = self.console.read("Moving to which direction?: ").lower()
         try:
-            needs_switch = self.pymon.move(direction, self.__game_state)
+            needs_switch = self.timed("path.move", self.pymon.move, direction, self.__game_state)
+            self.log_event(
+                "move",
+                {
+                    "location": self.pymon.loc.name,
+                    "energy": self.pymon.energy,
+                    "move_count": self.pymon.move_count,
+                },
+            )
             if needs_switch:
                 self.switch_pymon_compulsory()
         except InvalidDirectionException as e:
@@ -167,24 +284,26 @@ class Operation:
 
     def pick_item(self):
         """Pick an item from the current location."""
-        item_name = input("Picking what item?: ").lower()
-        item = None
-        for i in self.pymon.loc.items:
-            if i.name.lower() == item_name:
-                item = i
-                break
+        item_name = self.console.read("Picking what item?: ").lower()
+        item = self.pymon.loc.get_item(item_name)
         if item:
-            self.pymon.pick_item(item)
+            if self.pymon.pick_item(item):
+                self.record.transfer_item(item, self.pymon.loc, self.pymon)
+                self.log_event("pick", {"item": item.name, "items": [self.record.item_row(item)]})
         else:
             print(f"There is no {item_name} in this location.")
 
     def view_inventory(self):
         """Display the inventory of the Pymon."""
+        before = self.__pymon_state()
         self.pymon.view_inventory()
+        after = self.__pymon_state()
+        if after != before:
+            self.log_event("use", after)
 
     def challenge_creature(self):
         """Challenge a creature in the current location."""
-        creature_name = input("Challenge who?: ").lower()
+        creature_name = self.console.read("Challenge who?: ").lower()
         creature_tmp = None
         for c in self.pymon.loc.creatures:
             if c.nickname.lower() == creature_name:
@@ -195,20 +314,22 @@ class Operation:
                 if isinstance(creature_tmp, Animal):
                     print(f"The {creature_tmp.nickname} just ignored you.")
                     return
-                captured_pymon = self.pymon.challenge(creature_tmp)
+                captured_pymon = self.timed("path.challenge", self.pymon.challenge, creature_tmp)
+                battle = self.__pymon_state()
+                battle["stat"] = self.pymon.battle_stats[-1]
+                self.log_event("battle", battle)
                 if captured_pymon and isinstance(captured_pymon, Pymon):
-                    self.game_state.bench_pymons.append(
+                    self.record.capture_creature(captured_pymon)
+                    self.game_state.bench_pymons.add(
+                        BenchPymon(captured_pymon.nickname, captured_pymon.desc)
+                    )
+                    self.log_event(
+                        "capture",
                         {
                             "nickname": captured_pymon.nickname,
                             "description": captured_pymon.desc,
-                            "inventory": [],
-                            "stats": {
-                                "energy": MAX_ENERGY,
-                                "has_immunity": False,
-                                "move_count": 0,
-                                "battle_stats": [],
-                            },
-                        }
+                            "creatures": [self.record.creature_row(captured_pymon)],
+                        },
                     )
                     print(f"{captured_pymon.nickname} has been added to your bench!")
             except AnimalCaptureError as e:
@@ -220,24 +341,77 @@ class Operation:
         """Display the battle stats of the Pymon."""
         self.pymon.display_battle_stats()
 
+    def query_battle_history(self):
+        """Show battle aggregates of the active Pymon and the bench, by opponent and time window."""
+        opponent = self.console.read("Opponent (press Enter for all opponents): ").strip() or None
+        days = self.console.read("Only the last how many days? (press Enter for all time): ").strip()
+        start = None
+        if days:
+            try:
+                start = int(time.time() - float(days) * SECONDS_PER_DAY)
+            except ValueError:
+                print("Invalid number of days.")
+                return
+
+        logs = [(self.pymon.nickname, self.pymon.battle_stats)]
+        for pymon in self.game_state.bench_pymons:
+            logs.append((pymon.nickname, pymon.battle_stats))
+        result = query_battles(logs, opponent, start)
+
+        against = f"against {opponent}" if opponent else "against all opponents"
+        window = f"in the last {days} days" if days else "of all time"
+        print(f"\nBattles {against} {window}: {result['battles']}")
+        if not result["battles"]:
+            return
+        print(f"Battles won: {result['won']} (win rate {result['win_rate']:.0%})")
+        print(f"Encounters: W: {result['wins']} D: {result['draws']} L: {result['losses']}")
+        if result["longest_losing_streak"]:
+            print(
+                f"Longest losing streak: {result['longest_losing_streak']} "
+                f"({result['streak_pymon']})"
+            )
+
+    def show_latency_stats(self):
+        """Show the latency percentiles of every command and game path timed so far."""
+        if self.__latency is None:
+            print("Latency recording is off. Start the game with --latency FILE to turn it on.")
+            return
+        self.__latency.report()
+
     def save_game(self):
         """Save the current game state."""
-        save_file = input("Enter save file name (default: save2024.csv): ").strip()
+        save_file = self.console.read(
+            f"Enter save file name, use {SNAPSHOT_EXT} for a binary snapshot (default: save2024.csv): "
+        ).strip()
         if not save_file:
             save_file = "save2024.csv"
-        self.record.save_game_state(save_file, self.__pymon)
+        if save_file.endswith(JOURNAL_EXT):
+            self.save_journal(save_file)
+        else:
+            self.timed(
+                "path.save", self.record.save_game_state,
+                save_file, self.__pymon, snapshot=save_file.endswith(SNAPSHOT_EXT)
+            )
         print(f"Game progress saved to {save_file}")
 
     def load_game(self):
         """Load a saved game state."""
-        save_file = input(
+        save_file = self.console.read(
             "Enter save file name to load (default: save2024.csv): "
         ).strip()
         if not save_file:
             save_file = "save2024.csv"
 
         try:
-            loaded_pymon = self.record.load_game_state(save_file)
+            journal = None
+            if save_file.endswith(JOURNAL_EXT):
+                self.close_journal()
+                journal = GameJournal(save_file)
+            loaded_pymon = self.timed(
+                "path.load", self.record.load_game_state,
+                save_file, snapshot=save_file.endswith(SNAPSHOT_EXT), journal=journal
+            )
+            self.__journal = journal
             if loaded_pymon:
                 self.pymon = loaded_pymon
                 self.game_state = self.record.game_state
@@ -253,26 +427,82 @@ class Operation:
             print("Starting with current Pymon state.")
             self.generate_stats()
 
+    def save_journal(self, save_file):
+        """Save in journaled mode: start a journal, or flush the one already in use."""
+        if self.__journal is not None and self.__journal.file_path == save_file:
+            self.__journal.flush()
+            print(f"Game saved successfully to {save_file}")
+            return
+        self.close_journal()
+        journal = GameJournal(save_file)
+        self.timed("path.save", self.record.save_game_state, save_file, self.__pymon, journal=journal)
+        self.__journal = journal
+
+    def close_journal(self):
+        """Finish any running compaction and stop journaling."""
+        if self.__journal is not None:
+            self.__journal.close()
+            self.__journal = None
+
+    def plan_route(self):
+        """Show the shortest route between two locations."""
+        start = self.console.read(
+            f"Route from which location? (default: {self.pymon.loc.name}): "
+        ).strip()
+        if not start:
+            start = self.pymon.loc.name
+        end = self.console.read("Route to which location?: ").strip()
+        try:
+            route = self.record.plan_route(start, end)
+        except GameError as e:
+            print(e)
+            return
+        if route is None:
+            print(f"There is no route from {start} to {end}.")
+        elif not route:
+            print(f"You are already at {end}.")
+        else:
+            print(f"Route from {start} to {end} ({len(route)} moves): {', '.join(route)}")
+
+    def close(self):
+        """Release the files held open by the operation."""
+        self.close_journal()
+        if self.__creature_registry is not None:
+            self.__creature_registry.close()
+            self.__creature_registry = None
+
     def quit(self):
         """Exit the program."""
         print("Exiting the program.")
+        self.close()
         sys.exit(0)
 
     def switch_pymon_compulsory(self):
-        """Force switch to a Pymon with energy when current Pymon runs out of energy."""
-        while True:
-            index = self.get_user_pymon()
-            if index is not None:
-                selected_pymon = self.game_state.bench_pymons[index]
-                if self.check_energy(selected_pymon):
-                    self.switch_pymon(index, selected_pymon)
-                    return
-                else:
-                    print("That Pymon has no energy! Choose another one.")
+        """
+        Force switch to a Pymon with energy when current Pymon runs out of energy.
+        Without a valid choice, the benched Pymon with the most energy steps in.
+        """
+        bench = self.game_state.bench_pymons
+        index = self.get_user_pymon()
+        if index is not None and not self.check_energy(bench[index]):
+            print("That Pymon has no energy!")
+            index = None
+        if index is None:
+            best_pymon = bench.best()
+            if best_pymon is None:
+                return
+            index = bench.slot_of(best_pymon.nickname)
+            print(f"{best_pymon.nickname} has the most energy and steps in.")
+        self.switch_pymon(index, bench[index])
 
     def get_user_pymon(self):
         """Prompt user to select a Pymon and return the corresponding index."""
-        choice = input("Enter the number of the Pymon you want to switch to: ")
+        choice = self.console.read(
+            "Enter the number of the Pymon you want to switch to "
+            "(or press Enter to pick the one with the most energy): "
+        )
+        if not choice:
+            return None
         try:
             index = int(choice) - 1
             if 0 <= index < len(self.game_state.bench_pymons):
@@ -285,11 +515,7 @@ class Operation:
 
     def check_energy(self, pymon):
         """Check if the selected Pymon has energy."""
-        res = False
-        if "stats" in pymon:
-            if pymon["stats"].get("energy", 0) > 0:
-                res = True
-        return res
+        return pymon.energy > 0
 
     def switch_pymon(self, index, selected_pymon):
         """Switch to the selected Pymon, update stats and inventory."""
@@ -302,59 +528,40 @@ class Operation:
         self.set_inventory(pymon_tmp, selected_pymon)
 
         # Update the bench with the current Pymon data
-        self.game_state.bench_pymons[index] = tmp_data
+        self.game_state.bench_pymons.swap(index, tmp_data)
 
         # Switch active Pymon
         self.pymon = pymon_tmp
+        self.log_event("switch", {"index": index})
         print(f"\nSwitched to {pymon_tmp.nickname}!")
         print(f"Energy: {pymon_tmp.energy}/{MAX_ENERGY}")
 
     def save_current_pymon(self):
         """Save the current Pymon's data to the bench."""
-        return {
-            "nickname": self.pymon.nickname,
-            "description": self.pymon.desc,
-            "inventory": [item.name for item in self.pymon.inventory],
-            "stats": {
-                "energy": self.pymon.energy,
-                "has_immunity": self.pymon.has_immunity,
-                "move_count": self.pymon.move_count,
-                "battle_stats": self.pymon.battle_stats,
-            },
-        }
+        return BenchPymon.from_pymon(self.pymon)
 
     def create_new_pymon(self, selected_pymon):
         """Create a new Pymon instance from the selected Pymon."""
         return Pymon(
-            selected_pymon["nickname"],
-            selected_pymon["description"],
+            selected_pymon.nickname,
+            selected_pymon.description,
             self.pymon.loc,
         )
 
     def set_stats(self, new_pymon, selected_pymon):
         """Set the stats for the new Pymon."""
-        if "stats" in selected_pymon:
-            new_pymon.energy = selected_pymon["stats"].get("energy", 3)
-            new_pymon.has_immunity = selected_pymon["stats"].get("has_immunity", False)
-            new_pymon.move_count = selected_pymon["stats"].get("move_count", 0)
-            new_pymon.battle_stats = selected_pymon["stats"].get("battle_stats", [])
+        new_pymon.energy = selected_pymon.energy
+        new_pymon.has_immunity = selected_pymon.has_immunity
+        new_pymon.move_count = selected_pymon.move_count
+        new_pymon.battle_stats = selected_pymon.battle_stats
 
     def find_item_in_locations(self, item_name):
         """Find an item by name across all locations and return the item and its location."""
-        for location in self.record.locations:
-            for item in location.items:
-                if item.name == item_name:
-                    return item, location
-        return None, None
+        return self.record.find_item_in_locations(item_name)
 
     def set_inventory(self, new_pymon, selected_pymon):
         """Set the inventory for the new Pymon."""
-        if selected_pymon.get("inventory"):
-            for item_name in selected_pymon["inventory"]:
-                item, location = self.find_item_in_locations(item_name)
-                if item:
-                    new_pymon.inventory.append(item)
-                    location.items.remove(item)
+        self.record.set_inventory(new_pymon, selected_pymon.inventory)
 
     def view_pymons(self):
         """Display all Pymons on the bench."""
@@ -362,14 +569,16 @@ class Operation:
             print("Your bench is empty. Capture some Pymons in battle!")
             return
 
-        print("\n### Bench Pymons ###")
-        for i, pymon in enumerate(self.game_state.bench_pymons, 1):
-            print(f"\n{i}) {pymon['nickname']}")
-            print(f"   Description: {pymon['description']}")
-            if "stats" in pymon:
-                print(f"   Energy: {pymon['stats'].get('energy', 3)}/3")
-            if pymon.get("inventory"):
-                print(f"   Inventory: {', '.join(pymon['inventory'])}")
+        with self.__renderer.screen() as screen:
+            if not screen:
+                return  # A quiet screen shows nothing, so the bench is not walked
+            screen.line("\n### Bench Pymons ###")
+            for i, pymon in enumerate(self.game_state.bench_pymons, 1):
+                screen.line("\n{}) {}", i, pymon.nickname)
+                screen.line("   Description: {}", pymon.description)
+                screen.line("   Energy: {}/3", pymon.energy)
+                if pymon.inventory:
+                    screen.line("   Inventory: {}", ", ".join(pymon.inventory))
 
     def switch_active_pymon(self):
         """Switch the currently active Pymon with one from the bench."""
@@ -387,11 +596,12 @@ class Operation:
             self.set_inventory(new_pymon, selected_pymon)
             self.update_bench(choice, current_pymon_data)
             self.pymon = new_pymon
+            self.log_event("switch", {"index": choice})
             self.switch_success(new_pymon)
 
     def get_pymon_switch_choice(self):
         """Prompt user for the Pymon they want to switch to."""
-        choice = input(
+        choice = self.console.read(
             "\nEnter the number of the Pymon you want to switch to (or press Enter to cancel): "
         )
         if not choice:
@@ -409,7 +619,7 @@ class Operation:
 
     def update_bench(self, index, current_pymon_data):
         """Update the bench with the current Pymon's data."""
-        self.game_state.bench_pymons[index] = current_pymon_data
+        self.game_state.bench_pymons.swap(index, current_pymon_data)
 
     def switch_success(self, new_pymon):
         """Display success message after switching to a new Pymon."""
@@ -426,9 +636,9 @@ class Operation:
         """Main menu loop."""
         while True:
             self.display_menu()
-            command = input("Enter your command: ")
+            command = self.console.read("Enter your command: ")
             self.command_multiplexer(command)
-            input("Press enter to continue")
+            self.console.pause()
 
     def generate_stats(self):
         """Generate and display stats."""
@@ -460,12 +670,12 @@ class Operation:
 
     def get_loc_details(self):
         """Prompt for and validate location details."""
-        name = input("Enter location name: ").strip()
+        name = self.console.read("Enter location name: ").strip()
         if not name:
             print("Error: Location name cannot be blank")
             return None, None
 
-        desc = input("Enter location description: ").strip()
+        desc = self.console.read("Enter location description: ").strip()
         if not desc:
             print("Error: Location description cannot be blank")
             return None, None
@@ -479,14 +689,14 @@ class Operation:
 
         for direction in ["west", "north", "east", "south"]:
             connect = (
-                input(
+                self.console.read(
                     f"Do you want to connect a location to the {direction}? (yes/no): "
                 )
                 .strip()
                 .lower()
             )
             if connect == "yes":
-                connected_loc = input(f"Enter {direction} door: ").strip()
+                connected_loc = self.console.read(f"Enter {direction} door: ").strip()
                 if connected_loc:
                     # Use property setter directly
                     if direction == "west":
@@ -508,10 +718,11 @@ class Operation:
         """Create, validate, and add a new location to the record."""
         try:
             tmp_loc = Location(name, desc)
-            tmp_loc.validate_new_loc(name, doors, self.record.locations)
+            tmp_loc.validate_new_loc(name, doors, self.record)
             new_loc = Location(name, desc)
             new_loc.doors = doors
             self.record.add_location(new_loc)
+            self.record.link_back(new_loc)
 
             self.update_loc_csv(new_loc)
             print("Custom location added successfully.")
@@ -519,113 +730,63 @@ class Operation:
             print(f"Error: {str(e)}")
 
     def update_loc_csv(self, new_loc):
-        """Update the locations.csv file with the new location and update bi-directional connections"""
-        lines = self.__read_loc_csv()
-        updated_lines = self.__update_existing_loc(lines, new_loc)
-        new_line = self.__create_new_loc_data(new_loc)
-        updated_lines.append(new_line)
-        self.__write_csv_loc(updated_lines)
-
-    def __read_loc_csv(self):
-        lines = []
-        with open("locations.csv", "r") as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    lines.append(line)
-        return lines
-
-    def __update_existing_loc(self, lines, new_location):
-        updated_lines = []
-        for line in lines:
-            parts = []
-            for part in line.split(","):
-                parts.append(part.strip())
-            if len(parts) >= 6:
-                loc_name = parts[0]
-                loc_desc = parts[1]
-
-                doors = Direction()
-                doors.west = parts[2].split("=")[1].strip()
-                doors.north = parts[3].split("=")[1].strip()
-                doors.east = parts[4].split("=")[1].strip()
-                doors.south = parts[5].split("=")[1].strip()
-
-                new_loc_doors = new_location.doors.to_dict()
-                for direction, connected_loc in new_loc_doors.items():
-                    if connected_loc == loc_name:
-                        opposite = Direction.get_opposite(direction)
-                        # Use property setter directly
-                        if opposite == "west":
-                            doors.west = new_location.name
-                        elif opposite == "north":
-                            doors.north = new_location.name
-                        elif opposite == "east":
-                            doors.east = new_location.name
-                        elif opposite == "south":
-                            doors.south = new_location.name
-
-                doors_dict = doors.to_dict()
-                updated_line = (
-                    f"{loc_name}, {loc_desc}, "
-                    f"west = {doors_dict['west']}, "
-                    f"north = {doors_dict['north']}, "
-                    f"east = {doors_dict['east']}, "
-                    f"south = {doors_dict['south']}"
-                )
-                updated_lines.append(updated_line)
-        return updated_lines
-
-    def __create_new_loc_data(self, new_loc):
-        doors_dict = new_loc.doors.to_dict()
-        return (
-            f"{new_loc.name}, {new_loc.desc}, "
-            f"west = {doors_dict['west']}, "
-            f"north = {doors_dict['north']}, "
-            f"east = {doors_dict['east']}, "
-            f"south = {doors_dict['south']}"
-        )
-
-    def __write_csv_loc(self, updated_lines):
-        with open("locations.csv", "w") as file:
-            file.write("\n".join(updated_lines) + "\n")
+        """Update the locations file with the new location and update bi-directional connections"""
+        store = self.location_store()
+        store.add_location(new_loc)
+        store.flush()
+        self.record.invalidate_world_cache()
+
+    def location_store(self):
+        """Get the incremental writer for the locations file of the record."""
+        if self.__location_store is None or self.__location_store.file_path != self.record.locations_file:
+            self.__location_store = LocationStore(self.record.locations_file)
+        return self.__location_store
 
     def add_creature(self):
         """Handle add custom creature"""
-        nickname = input("Enter creature nickname: ").strip()
+        nickname = self.console.read("Enter creature nickname: ").strip()
         if not nickname:
             print("Error: Creature nickname cannot be blank")
             return
 
-        desc = input("Enter creature description: ").strip()
+        registry = self.creature_registry()
+        if registry.contains(nickname):
+            print(f"Error: Creature nickname must be unique: {nickname}")
+            return
+
+        desc = self.console.read("Enter creature description: ").strip()
         if not desc:
             print("Error: Creature description cannot be blank")
             return
 
-        adoptable = input("Is this creature adoptable (yes/no)?: ").strip().lower()
+        adoptable = self.console.read("Is this creature adoptable (yes/no)?: ").strip().lower()
         if not adoptable or adoptable not in ["yes", "no"]:
             print("Error: Adoptable field must be either 'yes' or 'no'")
             return
 
+        try:
+            registry.add(nickname, desc, adoptable)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return
+        self.record.invalidate_world_cache()
+
         creature = (
             Pymon(nickname, desc)
             if adoptable == "yes"
             else Animal(nickname, desc)
         )
-
         self.record.add_creature(creature)
 
-        try:
-            with open("creatures.csv", "r") as f:
-                lines = f.readlines()
-                while lines and not lines[-1].strip():
-                    lines.pop()
-        except FileNotFoundError:
-            lines = []
-
-        with open("creatures.csv", "a") as f:
-            if lines and not lines[-1].endswith("\n"):
-                f.write("\n")
-            f.write(f"{nickname}, {desc}, {adoptable}\n")
-
         print("Custom creature added successfully.")
+
+    def creature_registry(self):
+        """Get the append-only writer for the creatures file of the record."""
+        if self.__creature_registry is None or self.__creature_registry.file_path != self.record.creatures_file:
+            if self.__creature_registry is not None:
+                self.__creature_registry.close()
+            self.__creature_registry = CreatureRegistry(
+                self.record.creatures_file,
+                [creature.nickname for creature in self.record.creatures],
+            )
+        return self.__creature_registry
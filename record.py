@@ -1,28 +1,143 @@
+import gc
+import random
+from array import array
 from game_state import GameState
 from location import Location
 from creature import Pymon, Animal
 from exceptions import GameError
+from world_graph import WorldGraph, DIRECTIONS, NO_DOOR
+from route_planner import RoutePlanner
+from item_effects import ItemCatalog
 from direction import Direction
+from world_cache import WorldCache
+
+PROGRESS_INTERVAL = 100000  # Rows between progress reports while loading
 
 
 class Record:
+    """
+    The authoritative world: locations, creatures and items, with the indexes to find
+    them. Objects changed after loading are kept in ordered change sets, so
+    a save writes only those and loading a save applies them back onto the world.
+    """
+
     def __init__(self):
         """Initialize Record with empty lists for locations and creatures."""
         self.locations = []
         self.creatures = []
+        self.items = []  # Every item of items.csv, by item ID
+        self.__game_state = None
         self.game_state = GameState()
-
-    def load_data(self, locations_file="locations.csv", creatures_file="creatures.csv", items_file="items.csv"):
-        """Load all game data from specified files."""
+        self.locations_file = "locations.csv"  # Data files the world was loaded from
+        self.creatures_file = "creatures.csv"
+        self.items_file = "items.csv"
+        self.world = WorldGraph()  # Location graph, also the name -> Location index
+        self.routes = RoutePlanner(self.world)
+        self.item_catalog = ItemCatalog()  # Item kinds and their compiled effects
+        # Hash indexes kept in sync with the lists above for O(1) lookups
+        self.__creature_index = {}  # creature nickname -> Creature
+        self.__item_index = {}  # item name -> {Item: owner (Location or Pymon)}
+        self.__placed_items = {}  # item name -> {Item: Location} for items lying in a location
+        self.__loose_items = {}  # item name -> {Item: None} for items out of the world with no owner
+        # Objects changed since loading, in the order they changed; dicts are used as ordered sets
+        self.__changed_locations = {}
+        self.__changed_items = {}
+        self.__changed_creatures = {}
+
+    @property
+    def game_state(self):
+        """Getter for the game state, which saves the changes of this world."""
+        return self.__game_state
+
+    @game_state.setter
+    def game_state(self, new_game_state):
+        new_game_state.world = self
+        self.__game_state = new_game_state
+        new_game_state.apply_world_changes()
+
+    def load_data(self, locations_file="locations.csv", creatures_file="creatures.csv", items_file="items.csv",
+                  progress=None, rng=random, cache=False):
+        """
+        Load all game data from specified files.
+        With cache, the world is loaded from the compiled world cache next to the
+        files when they are unchanged, and the cache is rebuilt after parsing them
+        otherwise. Items without a location are placed with rng either way.
+        """
+        self.locations_file = locations_file
+        self.creatures_file = creatures_file
+        self.items_file = items_file
+        world_cache = WorldCache(locations_file, creatures_file, items_file) if cache else None
         try:
-            self.load_locations(locations_file)
+            compiled = world_cache.load() if world_cache else None
+            if compiled is not None:
+                self.load_compiled(compiled, rng)
+                if progress and len(self.locations) >= PROGRESS_INTERVAL:
+                    progress(len(self.locations))
+                return
+
+            self.load_locations(locations_file, progress)
             self.load_creatures(creatures_file)
-            # Note: items loading would be handled by the Location class when loading locations
+            if world_cache:
+                item_rows = list(self.item_catalog.rows(items_file))
+                self.place_items(item_rows, rng)
+                world_cache.save(self.compile(item_rows))
+            else:
+                self.load_items(items_file, rng)
         except GameError as e:
             raise GameError(f"Error loading data: {str(e)}")
 
-    def load_locations(self, file_path):
-        """Load locations from a CSV file."""
+    def compile(self, item_rows):
+        """
+        Get the loaded world as plain data for the world cache: the location graph,
+        the creatures, the item kinds and the (item name, location name) rows of items.csv.
+        """
+        names, doors = self.world.compiled()
+        return {
+            "names": names,
+            "doors": doors,
+            "location_ids": array("i", (loc.loc_id for loc in self.locations)),
+            "descs": [loc.desc for loc in self.locations],
+            "creatures": [
+                (creature.nickname, creature.desc, isinstance(creature, Pymon)) for creature in self.creatures
+            ],
+            "item_kinds": self.item_catalog.kinds(),
+            "items": item_rows,
+        }
+
+    def load_compiled(self, compiled, rng=random):
+        """Build the world from the plain data made by compile(), without parsing any file."""
+        # Building hundreds of thousands of objects would trigger a collection every few
+        # hundred allocations, and none of them are garbage yet
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            names, location_ids = compiled["names"], compiled["location_ids"]
+            locations = [Location(names[loc_id], desc) for loc_id, desc in zip(location_ids, compiled["descs"])]
+            self.world.load_compiled(names, compiled["doors"], zip(location_ids, locations))
+            self.locations.extend(locations)
+            for nickname, desc, is_pymon in compiled["creatures"]:
+                self.add_creature(Pymon(nickname, desc) if is_pymon else Animal(nickname, desc))
+            for name, desc, is_pickable, is_consumable, spec in compiled["item_kinds"]:
+                self.item_catalog.add_kind(name, desc, is_pickable, is_consumable, spec)
+            self.place_items(compiled["items"], rng)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def invalidate_world_cache(self):
+        """Remove the compiled world cache after the data files were edited."""
+        WorldCache(self.locations_file, self.creatures_file, self.items_file).invalidate()
+
+    def load_locations(self, file_path, progress=None):
+        """
+        Load locations from a CSV file in a single streaming pass.
+        Door targets are interned in the world graph as they are read, so a door to a
+        location further down the file links up as soon as that location is added.
+        The optional progress callback receives the number of rows read so far, every
+        PROGRESS_INTERVAL rows and once more at the end; files smaller than that are not reported.
+        """
+        world = self.world
+        rows = 0
         try:
             with open(file_path, "r") as f:
                 # Skip header line
@@ -35,72 +150,139 @@ class Record:
                     if len(parts) >= 6:
                         name = parts[0]
                         desc = parts[1]
-                        west = parts[2]
-                        north = parts[3]
-                        east = parts[4]
-                        south = parts[5]
 
                         # Create location with name and description
                         location = Location(name, desc)
+                        self.add_location(location)
+
+                        # Link the doors by ID, reserving IDs for locations not read yet
+                        loc_id = location.loc_id
+                        for direction, connected_name in zip(DIRECTIONS, parts[2:6]):
+                            if connected_name == "None" or not connected_name:
+                                continue
+                            world.connect(loc_id, direction, world.intern(connected_name))
 
-                        # Create Direction object and set connections
-                        doors = Direction()
-                        doors.west = west if west != "None" else None
-                        doors.north = north if north != "None" else None
-                        doors.east = east if east != "None" else None
-                        doors.south = south if south != "None" else None
-                        location.doors = doors
-
-                        self.locations.append(location)
-
-            # Set up bi-directional connections
-            for loc in self.locations:
-                doors_dict = loc.doors.to_dict()
-                for direction, connected_name in doors_dict.items():
-                    if connected_name != 'None' and connected_name is not None:
-                        connected_location = self.find_location(connected_name)
-                        if connected_location:
-                            # Use property setter directly
-                            loc.doors.set_direction(connected_location, direction)
+                    rows += 1
+                    if progress and rows % PROGRESS_INTERVAL == 0:
+                        progress(rows)
+
+            # The final count, unless the file was too small for any progress to be worth reporting
+            if progress and rows > PROGRESS_INTERVAL and rows % PROGRESS_INTERVAL:
+                progress(rows)
 
         except FileNotFoundError:
             raise GameError(f"Location file not found: {file_path}")
         except Exception as e:
             raise GameError(f"Error loading locations: {str(e)}")
 
+    def load_items(self, file_path, rng=random):
+        """
+        Load items from a CSV file in a single streaming pass.
+        Every row is one item. It is placed in the location named in its location
+        column, or in a location picked with rng when the column is missing or empty
+        (pass a seeded random.Random for a reproducible distribution).
+        """
+        self.place_items(self.item_catalog.rows(file_path), rng)
+
+    def place_items(self, rows, rng=random):
+        """
+        Create an item for every (item name, location name or None) row and place it.
+        Items placed with rng are not where the data files put them, so they start changed.
+        """
+        catalog = self.item_catalog
+        for name, loc_name in rows:
+            if loc_name is not None:
+                location = self.world.find(loc_name)
+                if location is None:
+                    raise GameError(f"Unknown location for item {name}: {loc_name}")
+            elif self.locations:
+                location = rng.choice(self.locations)
+            else:
+                continue
+            item = catalog.create(name)
+            item.item_id = len(self.items)
+            self.items.append(item)
+            self.add_item(item, location)
+            if loc_name is None:
+                self.__mark(item, self.__changed_items)
+
     def find_location(self, name):
         """Find a location by name."""
-        for loc in self.locations:
-            if loc.name == name:
-                return loc
-        return None
+        return self.world.find(name)
+
+    def has_location(self, name):
+        """Check whether a location with this name exists."""
+        return self.world.find(name) is not None
+
+    def has_similar_location(self, doors):
+        """Check whether a location with exactly these doors (direction -> location name) exists."""
+        signature = []
+        for direction in DIRECTIONS:
+            name = doors.get(direction)
+            if name is None or name == "None":
+                signature.append(NO_DOOR)
+            else:
+                loc_id = self.world.id_of(name if isinstance(name, str) else name.name)
+                if loc_id is None:
+                    return False  # No location has a door to a name the world has never seen
+                signature.append(loc_id)
+        return self.world.has_signature(tuple(signature))
 
     def find_item_in_locations(self, item_name):
         """Find an item by name across all locations and return the item and its location."""
-        item_res, location_res = None, None
-        for location in self.locations:  # Loop through locaiton
-            for item in location.items:  # Loop through item
-                if item.name == item_name:  # If match location
-                    item_res = item
-                    location_res = location
-                    break
-        return item_res, location_res
+        placed = self.__placed_items.get(item_name)
+        if placed:
+            for item, location in placed.items():
+                return item, location
+        return None, None
+
+    def __index_item(self, item, owner):
+        """Record the current owner of an item in the item indexes."""
+        self.__item_index.setdefault(item.name, {})[item] = owner
+        for index, indexed in ((self.__placed_items, isinstance(owner, Location)), (self.__loose_items, owner is None)):
+            if indexed:
+                index.setdefault(item.name, {})[item] = owner
+            else:
+                same_name = index.get(item.name)
+                if same_name and item in same_name:
+                    del same_name[item]
+                    if not same_name:
+                        del index[item.name]
+
+    @staticmethod
+    def __mark(obj, changed):
+        """Add a world object to its change set."""
+        changed[obj] = None
+
+    def add_item(self, item, location):
+        """Place an item in a location and index it."""
+        location.add_item(item)
+        self.__index_item(item, location)
 
     def transfer_item(self, item, from_location, to_pymon):
         """Transfer an item from a location to a Pymon's inventory."""
-        if item in from_location.items:
-            from_location.items.remove(item)
+        if from_location.remove_item(item):
             to_pymon.inventory.append(item)
+            self.__index_item(item, to_pymon)
+            self.__mark(item, self.__changed_items)
             return True
         return False
 
-    def set_inventory(self, new_pymon, selected_pymon):
-        """Set the inventory for the new Pymon."""
-        if selected_pymon.get("inventory"):
-            for item_name in selected_pymon["inventory"]:
-                item, location = self.find_item_in_locations(item_name)
-                if item and location:
-                    self.transfer_item(item, location, new_pymon)
+    def set_inventory(self, new_pymon, item_names):
+        """
+        Give the new Pymon the named items: loose items, such as those a loaded save
+        took out of the world, first, then items taken from the locations.
+        """
+        for item_name in item_names:
+            loose = self.__loose_items.get(item_name)
+            if loose:
+                item = next(iter(loose))
+                new_pymon.inventory.append(item)
+                self.__index_item(item, new_pymon)
+                continue
+            item, location = self.find_item_in_locations(item_name)
+            if item and location:
+                self.transfer_item(item, location, new_pymon)
 
     def load_creatures(self, file_path):
         """Load creatures from a CSV file."""
@@ -122,32 +304,34 @@ class Record:
                             if is_pymon
                             else Animal(nickname, desc)
                         )
-                        self.creatures.append(creature)
+                        self.add_creature(creature)
 
         except FileNotFoundError:
             raise GameError(f"Creatures file not found: {file_path}")
         except Exception as e:
             raise GameError(f"Error loading creatures: {str(e)}")
 
-    def save_game_state(self, file_path, pymon):
-        """Save the current game state."""
+    def sync_user_pymon(self, pymon):
+        """Point the game state at the live Pymon, which saves read directly."""
+        self.game_state.attach_pymon(pymon)
+
+    def save_game_state(self, file_path, pymon, snapshot=False, journal=None):
+        """
+        Save the current game state, as a binary snapshot if requested or as CSV.
+        If a GameJournal is given, a fresh journal is started from the current state.
+        """
         try:
             # Update game state with current data
-            self.game_state.user_pymon = {
-                "nickname": pymon.nickname,
-                "description": pymon.desc,
-                "location": pymon.loc.name if pymon.loc else "None",
-                "stats": {
-                    "energy": pymon.energy,
-                    "has_immunity": pymon.has_immunity,
-                    "move_count": pymon.move_count,
-                    "battle_stats": pymon.battle_stats,
-                },
-                "inventory": [item.name for item in pymon.inventory],
-            }
+            self.sync_user_pymon(pymon)
 
             # Save game state
-            self.game_state.save_game(file_path)
+            if journal:
+                journal.start(self.game_state)
+                print(f"Game saved successfully to {file_path}")
+            elif snapshot:
+                self.game_state.save_snapshot(file_path)
+            else:
+                self.game_state.save_game(file_path)
 
         except Exception as e:
             raise GameError(f"Failed to save game state: {str(e)}")
@@ -155,23 +339,155 @@ class Record:
     def add_creature(self, creature):
         """Add creature to record"""
         self.creatures.append(creature)
+        self.__creature_index[creature.nickname] = creature
+
+    def capture_creature(self, creature):
+        """Update the record after a creature has been captured onto the bench."""
+        if self.__creature_index.get(creature.nickname) is creature:
+            del self.__creature_index[creature.nickname]
+        self.__mark(creature, self.__changed_creatures)
+
+    def place_creatures(self, rng=random):
+        """Place every creature at a random location, e.g. at the start of a new game."""
+        if not self.locations:
+            return
+        for creature in self.creatures:
+            if creature.loc and creature in creature.loc.creatures:
+                creature.loc.creatures.remove(creature)
+            location = rng.choice(self.locations)
+            location.add_creature(creature)
+            creature.loc = location
+            self.__creature_index[creature.nickname] = creature
+            self.__mark(creature, self.__changed_creatures)
 
     def add_location(self, loc):
+        """Add location to record"""
         self.locations.append(loc)
+        self.world.add_location(loc)
+        for item in loc.items:
+            self.__index_item(item, loc)
+
+    def link_back(self, loc):
+        """
+        Point the opposite door of every location this location leads to back at it.
+        The location and its neighbours are marked as changed.
+        """
+        self.__mark(loc, self.__changed_locations)
+        for direction in DIRECTIONS:
+            connected_loc = loc.get_door(direction)
+            if connected_loc:
+                self.world.connect(connected_loc.loc_id, Direction.get_opposite(direction), loc.loc_id)
+                self.__mark(connected_loc, self.__changed_locations)
+
+    def changes(self):
+        """
+        Get the world objects changed since the data files were loaded, as rows:
+        items as (item ID, name, location name or "None", pickable, consumable),
+        locations as (name, description, direction -> door name) and creatures as
+        (nickname, description, location name or "None", is Pymon).
+        """
+        world = self.world
+        location_rows = []
+        for loc in self.__changed_locations:
+            doors = {}
+            for direction in DIRECTIONS:
+                target = world.neighbour_id(loc.loc_id, direction)
+                doors[direction] = None if target == NO_DOOR else world.name_of(target)
+            location_rows.append((loc.name, loc.desc, doors))
+
+        item_rows = [self.item_row(item) for item in self.__changed_items]
+        creature_rows = [self.creature_row(creature) for creature in self.__changed_creatures]
+        return item_rows, location_rows, creature_rows
+
+    def item_row(self, item):
+        """Get the change row of an item, in the format of changes()."""
+        owner = self.__item_index.get(item.name, {}).get(item)
+        location = owner.name if isinstance(owner, Location) else "None"
+        return item.item_id, item.name, location, item.is_pickable, item.is_consumable
+
+    @staticmethod
+    def creature_row(creature):
+        """Get the change row of a creature, in the format of changes()."""
+        location = creature.loc.name if creature.loc else "None"
+        return creature.nickname, creature.desc, location, isinstance(creature, Pymon)
+
+    def apply_changes(self, item_rows, location_rows, creature_rows):
+        """
+        Apply saved rows in the format of changes() onto the world: locations first,
+        so items and creatures can be placed in locations the save added.
+        Items saved outside the world are kept loose for set_inventory to hand out.
+        """
+        for name, desc, doors in location_rows:
+            loc = self.find_location(name)
+            if loc is None:
+                loc = Location(name, desc)
+                self.add_location(loc)
+            loc.desc = desc
+            self.world.set_doors(loc.loc_id, doors)
+            self.__mark(loc, self.__changed_locations)
+
+        for item_id, name, loc_name, is_pickable, is_consumable in item_rows:
+            item = self.items[item_id] if item_id is not None and item_id < len(self.items) else None
+            if item is None or item.name != name:
+                item, _ = self.find_item_in_locations(name)  # A save without item IDs
+                if item is None:
+                    continue
+            owner = self.__item_index.get(item.name, {}).get(item)
+            if isinstance(owner, Location):
+                owner.remove_item(item)
+            elif owner is not None and item in owner.inventory:
+                owner.inventory.remove(item)
+            location = self.find_location(loc_name) if loc_name != "None" else None
+            if location is not None:
+                self.add_item(item, location)
+            else:
+                self.__index_item(item, None)
+            item.is_pickable = is_pickable
+            item.is_consumable = is_consumable
+            self.__mark(item, self.__changed_items)
+
+        for nickname, desc, loc_name, is_pymon in creature_rows:
+            creature = self.__creature_index.get(nickname)
+            location = self.find_location(loc_name) if loc_name != "None" else None
+            if creature is None:
+                if location is None:
+                    continue  # Captured, and already out of this world
+                creature = Pymon(nickname, desc) if is_pymon else Animal(nickname, desc)
+                self.add_creature(creature)
+            if creature.loc is not None:
+                creature.loc.remove_creature(creature)
+            creature.loc = location
+            if location is not None:
+                location.add_creature(creature)
+            else:
+                del self.__creature_index[nickname]
+            self.__mark(creature, self.__changed_creatures)
+
+    def plan_route(self, start_name, end_name):
+        """Get the shortest list of directions between two locations, or None if there is no route."""
+        return self.routes.route(start_name, end_name)
 
     def set_pymon_location(self, pymon, loc_name):
         """Set the location of a Pymon based on location name."""
         if loc_name != "None":
-            for loc in self.locations:  # Loop through the locations
-                if loc.name == loc_name:
-                    pymon.loc = loc
-                    break
-
-    def load_game_state(self, f_path):
-        """Load a saved game state."""
+            loc = self.find_location(loc_name)
+            if loc:
+                pymon.loc = loc
+
+    def load_game_state(self, f_path, snapshot=False, journal=None):
+        """
+        Load a saved game state from a GameJournal, from a binary snapshot if requested
+        or from CSV.
+        """
         try:
             # Load game state
-            self.game_state.load_game(f_path)
+            if journal:
+                journal.load(self.game_state)
+                print(f"Game loaded successfully from {f_path}")
+            elif snapshot:
+                self.game_state.load_snapshot(f_path)
+            else:
+                self.game_state.load_game(f_path)
 
             # Create Pymon from loaded data
             user_pymon_data = self.game_state.user_pymon
@@ -194,8 +510,10 @@ class Record:
                 pymon.battle_stats = stats["battle_stats"]
 
                 # Set inventory using the abstracted method
-                self.set_inventory(pymon, user_pymon_data)
+                self.set_inventory(pymon, user_pymon_data.get("inventory", []))
 
+                # The live Pymon is the user Pymon from now on
+                self.game_state.attach_pymon(pymon)
                 return pymon
 
         except Exception as e:
@@ -0,0 +1,103 @@
+import sys
+
+
+class Screen:
+    """
+    One screen of game output, built line by line and written in a single call.
+    Lines are kept as templates and arguments, and only formatted when the screen
+    is written.
+    """
+
+    __slots__ = ("__renderer", "__parts")
+
+    def __init__(self, renderer):
+        """Initialize an empty screen for a renderer."""
+        self.__renderer = renderer
+        self.__parts = []  # (template, args, is_rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.__renderer.write(self.render())
+        return False
+
+    def line(self, template="", *args):
+        """Add a line; with arguments, the template is formatted with str.format."""
+        self.__parts.append((template, args, False))
+
+    def lines(self, template, rows):
+        """Add one line per row of arguments. The rows are only iterated when the screen is written."""
+        self.__parts.append((template, rows, True))
+
+    def render(self):
+        """Format every line of the screen into one string."""
+        out = []
+        for template, args, is_rows in self.__parts:
+            if is_rows:
+                out.extend(template.format(*row) for row in args)
+            elif args:
+                out.append(template.format(*args))
+            else:
+                out.append(template)
+        return "\n".join(out) + "\n" if out else ""
+
+
+class NullScreen:
+    """Screen of a quiet renderer: every line is dropped without being formatted."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def line(self, template="", *args):
+        """Drop a line."""
+
+    def lines(self, template, rows):
+        """Drop the lines without iterating the rows."""
+
+    def render(self):
+        return ""
+
+
+NULL_SCREEN = NullScreen()
+
+
+class Renderer:
+    """
+    Writes game screens to a stream, sys.stdout by default. A quiet renderer builds
+    nothing and writes nothing, for headless runs.
+    """
+
+    def __init__(self, stream=None, quiet=False):
+        """Initialize the renderer with the stream to write to."""
+        self.__stream = stream
+        self.__quiet = quiet
+
+    @property
+    def quiet(self):
+        """Getter for whether output is discarded"""
+        return self.__quiet
+
+    def screen(self):
+        """Start a screen, written when its with block ends."""
+        if self.__quiet:
+            return NULL_SCREEN
+        return Screen(self)
+
+    def write(self, text):
+        """Write rendered text to the stream."""
+        if text and not self.__quiet:
+            # sys.stdout is looked up on every write so redirect_stdout applies
+            (self.__stream or sys.stdout).write(text)
+
+
+DEFAULT_RENDERER = Renderer()
+QUIET_RENDERER = Renderer(quiet=True)
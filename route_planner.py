@@ -0,0 +1,82 @@
+from array import array
+from collections import OrderedDict, deque
+from exceptions import GameError
+from world_graph import DIRECTIONS, NO_DOOR
+
+CACHE_SIZE = 64  # Number of start locations whose search results are kept
+
+
+class RoutePlanner:
+    """
+    Shortest routes over the doors of a WorldGraph.
+    One breadth-first search from a start location gives the shortest route to every
+    location, so the search tree is cached per start location and later queries only
+    walk back along the route. The cache is dropped whenever the graph changes.
+    """
+
+    def __init__(self, world):
+        """Initialize the planner for a world graph."""
+        self.__world = world
+        self.__trees = OrderedDict()  # start ID -> (parent IDs, direction index taken)
+        self.__version = world.version
+
+    def invalidate(self):
+        """Drop all cached search results."""
+        self.__trees.clear()
+        self.__version = self.__world.version
+
+    def route(self, start_name, end_name):
+        """
+        Get the shortest list of directions from one location to another,
+        or None if the end cannot be reached.
+        """
+        world = self.__world
+        start = world.id_of(start_name)
+        if start is None or world.location(start) is None:
+            raise GameError(f"Unknown location: {start_name}")
+        end = world.id_of(end_name)
+        if end is None or world.location(end) is None:
+            raise GameError(f"Unknown location: {end_name}")
+
+        if self.__version != world.version:
+            self.invalidate()
+        tree = self.__trees.get(start)
+        if tree is None:
+            tree = self.__search(start)
+            self.__trees[start] = tree
+            if len(self.__trees) > CACHE_SIZE:
+                self.__trees.popitem(last=False)
+        else:
+            self.__trees.move_to_end(start)
+
+        parents, taken = tree
+        if end != start and parents[end] == NO_DOOR:
+            return None
+        route = []
+        loc_id = end
+        while loc_id != start:
+            route.append(DIRECTIONS[taken[loc_id]])
+            loc_id = parents[loc_id]
+        route.reverse()
+        return route
+
+    def __search(self, start):
+        """Breadth-first search from a start location over existing locations."""
+        world = self.__world
+        size = len(world)
+        parents = array("i", [NO_DOOR]) * size
+        taken = array("b", [-1]) * size
+        parents[start] = start
+        doors = world.adjacency()
+        location = world.location
+        queue = deque([start])
+        while queue:
+            loc_id = queue.popleft()
+            for index, direction_doors in enumerate(doors):
+                target = direction_doors[loc_id]
+                if target != NO_DOOR and parents[target] == NO_DOOR and location(target) is not None:
+                    parents[target] = loc_id
+                    taken[target] = index
+                    queue.append(target)
+        parents[start] = NO_DOOR
+        return parents, taken
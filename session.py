@@ -0,0 +1,114 @@
+import random
+from creature import Pymon
+from exceptions import GameError
+from operation import Operation
+from record import Record
+
+
+class GameSession:
+    """
+    One independent game: it owns its Record (and so its world and GameState),
+    the active Pymon and the bench. Any number of sessions can run side by side
+    in one process.
+    A session goes through created -> loaded -> running -> closed.
+    """
+
+    CREATED = "created"
+    LOADED = "loaded"
+    RUNNING = "running"
+    CLOSED = "closed"
+
+    def __init__(self, session_id=None):
+        """Initialize an empty session."""
+        self.__session_id = session_id
+        self.__record = Record()
+        self.__operation = None
+        self.__state = GameSession.CREATED
+
+    @property
+    def session_id(self):
+        """Getter for the session ID."""
+        return self.__session_id
+
+    @property
+    def state(self):
+        """Getter for the lifecycle state."""
+        return self.__state
+
+    @property
+    def record(self):
+        """Getter for the game record."""
+        return self.__record
+
+    @property
+    def game_state(self):
+        """Getter for the game state."""
+        return self.__record.game_state
+
+    @property
+    def operation(self):
+        """Getter for the Operation driving the session, once it is running."""
+        return self.__operation
+
+    @property
+    def pymon(self):
+        """Getter for the active Pymon, once the session is running."""
+        return self.__operation.pymon if self.__operation else None
+
+    @property
+    def bench(self):
+        """Getter for the bench Pymons."""
+        return self.__operation.game_state.bench_pymons if self.__operation else self.game_state.bench_pymons
+
+    def __check_state(self, expected, action):
+        """Raise a GameError when an action is not allowed in the current state."""
+        if self.__state != expected:
+            raise GameError(f"Cannot {action} a session that is {self.__state}.")
+
+    def load(self, locations_file="locations.csv", creatures_file="creatures.csv", items_file="items.csv",
+             progress=None, rng=random, cache=False):
+        """
+        Load the world of the session from its data files, placing items with rng.
+        With cache, the compiled world cache next to the files is used and kept up to date.
+        """
+        self.__check_state(GameSession.CREATED, "load")
+        self.__record.load_data(
+            locations_file=locations_file,
+            creatures_file=creatures_file,
+            items_file=items_file,
+            progress=progress,
+            rng=rng,
+            cache=cache,
+        )
+        self.__state = GameSession.LOADED
+
+    def begin(self, pymon=None, rng=random, console=None, latency=None, renderer=None):
+        """
+        Start playing, with the given Pymon or the default one at a random location.
+        Input is read from the console, the keyboard by default. Commands are timed
+        into the LatencyRecorder if one is given, and screens go to the renderer.
+        """
+        self.__check_state(GameSession.LOADED, "begin")
+        if pymon is None:
+            pymon = Pymon(
+                "Kimimon",
+                "White and yellow Pymon with a square face",
+                rng.choice(self.__record.locations),
+            )
+        self.__operation = Operation(pymon, self.__record, console, latency, renderer)
+        self.__state = GameSession.RUNNING
+        return self.__operation
+
+    def close(self):
+        """End the session and release what it holds open."""
+        if self.__state == GameSession.CLOSED:
+            return
+        if self.__operation:
+            self.__operation.close()
+        self.__state = GameSession.CLOSED
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
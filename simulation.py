@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from creature import Pymon
+from item import MAX_ENERGY
+from exceptions import GameOverException
+from game_state import GameState
+from bench import BenchPymon
+from record import Record
+from renderer import QUIET_RENDERER
+from world_graph import DIRECTIONS
+
+MAX_MOVES = 10000  # Moves after which a simulated game is stopped
+
+_record = None  # World loaded once per worker process
+_null_output = None
+
+
+class HeadlessPymon(Pymon):
+    """Pymon driven by a random number generator instead of the player, with its screens not rendered."""
+
+    def __init__(self, nickname, desc, loc=None, rng=None):
+        super().__init__(nickname, desc, loc)
+        self.rng = rng or random.Random()
+        self.renderer = QUIET_RENDERER
+
+    def get_player_choice(self):
+        """Choose rock, paper or scissors at random."""
+        return self.rng.choice(["r", "p", "s"])
+
+    def get_move_opponent(self):
+        """Get a random choice for the opponent from the game's own random stream."""
+        return self.rng.choice(["r", "p", "s"])
+
+    def end_game(self):
+        """End the game without exiting the process."""
+        raise GameOverException()
+
+
+def game_seed(seed, index):
+    """Seed of one game; each game gets an independent random stream from it."""
+    return f"{seed}:{index}"
+
+
+def _init_worker(locations_file, creatures_file, items_file, seed):
+    """Load the world once in a worker process, with the items placed from the run's seed."""
+    global _record, _null_output
+    _record = Record()
+    _record.load_data(
+        locations_file=locations_file,
+        creatures_file=creatures_file,
+        items_file=items_file,
+        rng=random.Random(seed),
+    )
+    _null_output = open(os.devnull, "w")
+
+
+def _switch_pymon(pymon, bench, rng):
+    """Replace a Pymon that ran out of energy with a bench Pymon that still has energy."""
+    data = bench.best()
+    if data is None:
+        raise GameOverException()
+    bench.remove(data.nickname)
+    new_pymon = HeadlessPymon(data.nickname, data.description, pymon.loc, rng)
+    new_pymon.energy = data.energy
+    return new_pymon
+
+
+def _pick_and_use_items(pymon, taken):
+    """
+    Pick up the usable items at the Pymon's location, then use what helps it now:
+    energy items while it is below full energy and an immunity item while it has
+    none. Items that need the player's answer, like the binocular, are left on the
+    ground. The world is shared by every game of a worker, so picked items are only
+    added to taken instead of being removed from their location.
+    Returns the number of items used.
+    """
+    for item in pymon.loc.items:
+        effect = item.effect
+        if item.is_pickable and effect is not None and not effect.reveal and not effect.decoration:
+            if item not in taken:
+                taken.add(item)
+                pymon.inventory.append(item)
+
+    used = 0
+    for item in list(pymon.inventory):
+        effect = item.effect
+        if (effect.energy_delta > 0 and pymon.energy < MAX_ENERGY) or (
+            effect.immunity and not pymon.has_immunity
+        ):
+            pymon.use_item(item)
+            used += 1
+    return used
+
+
+def play_game(record, seed, max_moves=MAX_MOVES):
+    """
+    Play one game with a random walker until every Pymon in the world is captured,
+    no Pymon has energy left, or max_moves is reached. Before every step the walker
+    picks up and uses the items around it. Returns the game metrics.
+    """
+    rng = random.Random(seed)
+    record.place_creatures(rng)
+    game_state = GameState()
+
+    wild_pymons = 0
+    for creature in record.creatures:
+        if isinstance(creature, Pymon):
+            wild_pymons += 1
+
+    pymon = HeadlessPymon(
+        "Kimimon", "White and yellow Pymon with a square face", rng.choice(record.locations), rng
+    )
+    metrics = {
+        "moves": 0, "captures": 0, "items_used": 0, "energy_outs": 0, "completed": False, "game_over": False
+    }
+    taken = set()  # Items picked in this game
+    try:
+        while metrics["moves"] < max_moves and metrics["captures"] < wild_pymons:
+            metrics["items_used"] += _pick_and_use_items(pymon, taken)
+            opponent = None
+            if pymon.energy > 0:
+                for creature in pymon.loc.creatures:
+                    if isinstance(creature, Pymon):
+                        opponent = creature
+                        break
+
+            if opponent:
+                captured = pymon.challenge(opponent)
+                if captured:
+                    record.capture_creature(captured)
+                    metrics["captures"] += 1
+                    game_state.bench_pymons.add(BenchPymon(captured.nickname, captured.desc))
+                continue
+
+            doors = [direction for direction in DIRECTIONS if pymon.loc.get_door(direction)]
+            if not doors:
+                break
+            metrics["moves"] += 1
+            if pymon.move(rng.choice(doors), game_state):
+                metrics["energy_outs"] += 1
+                pymon = _switch_pymon(pymon, game_state.bench_pymons, rng)
+    except GameOverException:
+        metrics["game_over"] = True
+
+    metrics["wild_pymons"] = wild_pymons
+    metrics["completed"] = metrics["captures"] == wild_pymons
+    return metrics
+
+
+def _play_seeded_game(args):
+    """Play one game in a worker process with its output discarded."""
+    seed, max_moves = args
+    with contextlib.redirect_stdout(_null_output):
+        return play_game(_record, seed, max_moves)
+
+
+def summarize(results):
+    """Aggregate per-game metrics into a report."""
+    games = len(results)
+    report = {"games": games}
+    if not games:
+        return report
+    moves = [result["moves"] for result in results]
+    completed = [result["moves"] for result in results if result["completed"]]
+    report["mean_moves"] = sum(moves) / games
+    report["max_moves"] = max(moves)
+    report["mean_captures"] = sum(result["captures"] for result in results) / games
+    # Share of the wild Pymons captured, which still tells how far walkers get when none completes
+    report["capture_rate"] = sum(
+        result["captures"] / result["wild_pymons"] if result["wild_pymons"] else 1.0 for result in results
+    ) / games
+    report["mean_items_used"] = sum(result["items_used"] for result in results) / games
+    report["energy_outs"] = sum(result["energy_outs"] for result in results)
+    report["game_overs"] = sum(1 for result in results if result["game_over"])
+    report["completion_rate"] = len(completed) / games
+    report["mean_moves_to_complete"] = sum(completed) / len(completed) if completed else None
+    return report
+
+
+def run_simulation(games, seed=0, workers=None, locations_file="locations.csv",
+                   creatures_file="creatures.csv", max_moves=MAX_MOVES, items_file="items.csv"):
+    """
+    Play seeded games across a process pool and return the aggregate report.
+    Every worker places the items from seed, so a seed gives the same report
+    whatever the number of workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(game_seed(seed, i), max_moves) for i in range(games)]
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(locations_file, creatures_file, items_file, seed),
+    ) as executor:
+        results = list(executor.map(_play_seeded_game, tasks, chunksize=chunksize))
+    return summarize(results)
+
+
+def main():
+    """Command-line entry point of the simulation runner."""
+    parser = argparse.ArgumentParser(description="Play many random Pymon games without a player.")
+    parser.add_argument("locations_file", nargs="?", default="locations.csv")
+    parser.add_argument("creatures_file", nargs="?", default="creatures.csv")
+    parser.add_argument("items_file", nargs="?", default="items.csv")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="base seed of the games")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-moves", type=int, default=MAX_MOVES, help="moves before a game is stopped")
+    args = parser.parse_args()
+
+    report = run_simulation(
+        args.games,
+        seed=args.seed,
+        workers=args.workers,
+        locations_file=args.locations_file,
+        creatures_file=args.creatures_file,
+        items_file=args.items_file,
+        max_moves=args.max_moves,
+    )
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
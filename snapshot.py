@@ -0,0 +1,349 @@
+import mmap
+import os
+import struct
+from exceptions import GameError
+from bench import Bench, BenchPymon
+
+SNAPSHOT_EXT = ".pysnap"  # Save files with this extension use the binary snapshot format
+MAGIC = b"PYMS"
+VERSION = 2  # 2 added item IDs
+NONE_REF = 0xFFFFFFFF  # String reference meaning "None"
+
+HEADER = struct.Struct("<4sHH")  # magic, version, number of sections
+SECTION = struct.Struct("<4sI")  # section tag, payload length in bytes
+COUNT = struct.Struct("<I")
+ITEM = struct.Struct("<IIBI")  # name, location, flags (1 = pickable, 2 = consumable), item ID
+ITEM_V1 = struct.Struct("<IIB")  # name, location, flags
+LOCATION = struct.Struct("<IIIIII")  # name, description, west, north, east, south
+CREATURE = struct.Struct("<IIIB")  # name, description, location, is_pymon
+PYMON = struct.Struct("<IIIBBIII")  # nickname, description, location, energy, has_immunity,
+# move_count, number of inventory items, number of battle records
+BATTLE = struct.Struct("<IIHHH")  # timestamp, opponent, wins, draws, losses
+JOURNAL_SEQ = struct.Struct("<Q")  # last journal record folded into the snapshot
+
+DOOR_ORDER = ("west", "north", "east", "south")
+
+
+class SnapshotWriter:
+    """
+    Writer for the binary snapshot save format.
+    A snapshot is a header followed by length-prefixed sections. All strings are
+    interned into one table so records are fixed-width structs of string references.
+    """
+
+    def __init__(self):
+        """Initialize the writer with an empty string table."""
+        self.__strings = []
+        self.__string_refs = {}
+        self.__sections = []
+
+    def ref(self, value):
+        """Get the string table reference for a value, interning it if needed."""
+        if value is None or value == "None":
+            return NONE_REF
+        if not isinstance(value, str):
+            value = getattr(value, "name", str(value))
+        string_ref = self.__string_refs.get(value)
+        if string_ref is None:
+            string_ref = len(self.__strings)
+            self.__string_refs[value] = string_ref
+            self.__strings.append(value)
+        return string_ref
+
+    def add_section(self, tag, payload):
+        """Add a section with a four byte tag."""
+        self.__sections.append((tag, payload))
+
+    def write(self, file_path):
+        """Write the string table and all sections atomically to a file."""
+        table = bytearray(COUNT.pack(len(self.__strings)))
+        for value in self.__strings:
+            data = value.encode("utf-8")
+            table += COUNT.pack(len(data))
+            table += data
+        sections = [(b"STRS", table)] + self.__sections
+
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+            for tag, payload in sections:
+                f.write(SECTION.pack(tag, len(payload)))
+                f.write(payload)
+        os.replace(tmp_path, file_path)
+
+
+class SnapshotReader:
+    """Reader for the binary snapshot save format, working directly on a memory map."""
+
+    def __init__(self, buffer):
+        """Parse the header and locate each section without copying the payloads."""
+        self.__buffer = buffer
+        if len(buffer) < HEADER.size:
+            raise GameError("Snapshot file is truncated.")
+        magic, version, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise GameError("Not a Pymon snapshot file.")
+        if version > VERSION:
+            raise GameError(f"Unsupported snapshot version: {version}")
+        self.version = version
+        self.__sections = {}
+        offset = HEADER.size
+        for _ in range(count):
+            tag, length = SECTION.unpack_from(buffer, offset)
+            offset += SECTION.size
+            self.__sections[tag] = (offset, length)
+            offset += length
+        self.__strings = self.__read_strings()
+
+    def __read_strings(self):
+        """Decode the string table."""
+        strings = []
+        offset, _ = self.__sections.get(b"STRS", (None, 0))
+        if offset is None:
+            return strings
+        (count,) = COUNT.unpack_from(self.__buffer, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            (length,) = COUNT.unpack_from(self.__buffer, offset)
+            offset += COUNT.size
+            strings.append(str(self.__buffer[offset:offset + length], "utf-8"))
+            offset += length
+        return strings
+
+    def string(self, string_ref):
+        """Get the string for a reference, or None."""
+        if string_ref == NONE_REF:
+            return None
+        return self.__strings[string_ref]
+
+    def has_section(self, tag):
+        """Check whether the snapshot contains a section."""
+        return tag in self.__sections
+
+    def section(self, tag):
+        """Get the offset of a section payload, or None if it is missing."""
+        offset, _ = self.__sections.get(tag, (None, 0))
+        return offset
+
+    def records(self, tag, record):
+        """Iterate over a section made of a count followed by fixed-width records."""
+        offset = self.section(tag)
+        if offset is None:
+            return iter(())
+        (count,) = COUNT.unpack_from(self.__buffer, offset)
+        start = offset + COUNT.size
+        return struct.iter_unpack(record.format, self.__buffer[start:start + count * record.size])
+
+    def unpack(self, record, offset):
+        """Unpack one struct at an offset and return the values and the next offset."""
+        return record.unpack_from(self.__buffer, offset), offset + record.size
+
+
+def _pack_records(record, rows):
+    """Pack rows of values into a count-prefixed section payload."""
+    payload = bytearray(COUNT.pack(len(rows)))
+    for row in rows:
+        payload += record.pack(*row)
+    return payload
+
+
+def _inventory_names(inventory):
+    """Get item names from an inventory of names or Item objects."""
+    names = []
+    for item in inventory:
+        names.append(item if isinstance(item, str) else item.name)
+    return names
+
+
+def pymon_fields(pymon):
+    """
+    Get (nickname, description, location name, energy, has_immunity, move_count,
+    inventory names, battle stats) of a Pymon given as a live Pymon, a BenchPymon or
+    a saved dictionary, without copying its battle history.
+    """
+    if isinstance(pymon, dict):
+        stats = pymon.get("stats", {})
+        return (
+            pymon.get("nickname", ""),
+            pymon.get("description", ""),
+            pymon.get("location", "None"),
+            stats.get("energy", 3),
+            bool(stats.get("has_immunity", False)),
+            stats.get("move_count", 0),
+            _inventory_names(pymon.get("inventory", [])),
+            stats.get("battle_stats", []),
+        )
+    if isinstance(pymon, BenchPymon):
+        return (
+            pymon.nickname, pymon.description, "None", pymon.energy, pymon.has_immunity,
+            pymon.move_count, _inventory_names(pymon.inventory), pymon.battle_stats,
+        )
+    return (
+        pymon.nickname, pymon.desc, pymon.loc.name if pymon.loc else "None", pymon.energy,
+        pymon.has_immunity, pymon.move_count, _inventory_names(pymon.inventory), pymon.battle_stats,
+    )
+
+
+def pymon_dict(nickname, desc, location, energy, has_immunity, move_count, inventory, battle_stats):
+    """Build the saved dictionary form of a Pymon from its fields."""
+    return {
+        "nickname": nickname,
+        "description": desc,
+        "location": location or "None",
+        "stats": {
+            "energy": energy,
+            "has_immunity": bool(has_immunity),
+            "move_count": move_count,
+            "battle_stats": battle_stats,
+        },
+        "inventory": inventory,
+    }
+
+
+def _pack_pymon(writer, payload, pymon):
+    """Append one Pymon record, its inventory references and battle records to a payload."""
+    nickname, desc, location, energy, has_immunity, move_count, inventory, battle_stats = pymon_fields(pymon)
+    payload += PYMON.pack(
+        writer.ref(nickname),
+        writer.ref(desc),
+        writer.ref(location),
+        energy,
+        bool(has_immunity),
+        move_count,
+        len(inventory),
+        len(battle_stats),
+    )
+    for name in inventory:
+        payload += COUNT.pack(writer.ref(name))
+    for stat in battle_stats:
+        payload += BATTLE.pack(
+            writer.ref(stat["timestamp"]),
+            writer.ref(stat["opponent"]),
+            stat["wins"],
+            stat["draws"],
+            stat["losses"],
+        )
+
+
+def _unpack_pymon(reader, offset):
+    """Read one Pymon record written by _pack_pymon and return it with the next offset."""
+    values, offset = reader.unpack(PYMON, offset)
+    nickname, desc, location, energy, has_immunity, move_count, n_items, n_battles = values
+    inventory = []
+    for _ in range(n_items):
+        (string_ref,), offset = reader.unpack(COUNT, offset)
+        inventory.append(reader.string(string_ref))
+    battle_stats = []
+    for _ in range(n_battles):
+        (timestamp, opponent, wins, draws, losses), offset = reader.unpack(BATTLE, offset)
+        battle_stats.append({
+            "timestamp": reader.string(timestamp),
+            "opponent": reader.string(opponent),
+            "wins": wins,
+            "draws": draws,
+            "losses": losses,
+        })
+    pymon = pymon_dict(
+        reader.string(nickname), reader.string(desc), reader.string(location),
+        energy, has_immunity, move_count, inventory, battle_stats,
+    )
+    return pymon, offset
+
+
+def write_snapshot(game_state, file_path, journal_seq=None):
+    """
+    Write a GameState to a binary snapshot file.
+    journal_seq records the last journal record the snapshot includes, for journaled saves.
+    """
+    writer = SnapshotWriter()
+    item_rows, location_rows, creature_rows = game_state.world_changes()
+
+    rows = []
+    for item_id, name, location, is_pickable, is_consumable in item_rows:
+        flags = (1 if is_pickable else 0) | (2 if is_consumable else 0)
+        rows.append((writer.ref(name), writer.ref(location), flags, NONE_REF if item_id is None else item_id))
+    writer.add_section(b"ITEM", _pack_records(ITEM, rows))
+
+    rows = []
+    for name, desc, doors in location_rows:
+        rows.append(
+            (writer.ref(name), writer.ref(desc))
+            + tuple(writer.ref(doors.get(direction)) for direction in DOOR_ORDER)
+        )
+    writer.add_section(b"LOCS", _pack_records(LOCATION, rows))
+
+    rows = []
+    for name, desc, location, is_pymon in creature_rows:
+        rows.append((writer.ref(name), writer.ref(desc), writer.ref(location), bool(is_pymon)))
+    writer.add_section(b"CRTS", _pack_records(CREATURE, rows))
+
+    payload = bytearray()
+    _pack_pymon(writer, payload, game_state.pymon if game_state.pymon is not None else game_state.user_pymon)
+    writer.add_section(b"USER", payload)
+
+    payload = bytearray(COUNT.pack(len(game_state.bench_pymons)))
+    for pymon in game_state.bench_pymons:
+        _pack_pymon(writer, payload, pymon)
+    writer.add_section(b"BNCH", payload)
+
+    if journal_seq is not None:
+        writer.add_section(b"JSEQ", JOURNAL_SEQ.pack(journal_seq))
+
+    writer.write(file_path)
+
+
+def read_snapshot(game_state, file_path):
+    """
+    Load a binary snapshot file into a GameState through a read-only memory map.
+    Returns the journal sequence number stored in the snapshot, or 0.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise GameError(f"Snapshot file is empty: {file_path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buffer:
+                reader = SnapshotReader(buffer)
+                _read_sections(reader, game_state)
+                offset = reader.section(b"JSEQ")
+                if offset is None:
+                    return 0
+                (journal_seq,), _ = reader.unpack(JOURNAL_SEQ, offset)
+                return journal_seq
+
+
+def _read_sections(reader, game_state):
+    """Fill a GameState from the sections of a snapshot."""
+    string = reader.string
+
+    item_rows = []
+    if reader.version >= 2:
+        for name, location, flags, item_id in reader.records(b"ITEM", ITEM):
+            item_id = None if item_id == NONE_REF else item_id
+            item_rows.append((item_id, string(name), string(location) or "None", bool(flags & 1), bool(flags & 2)))
+    else:
+        for name, location, flags in reader.records(b"ITEM", ITEM_V1):
+            item_rows.append((None, string(name), string(location) or "None", bool(flags & 1), bool(flags & 2)))
+
+    location_rows = []
+    for name, desc, *door_refs in reader.records(b"LOCS", LOCATION):
+        doors = {direction: string(door_ref) for direction, door_ref in zip(DOOR_ORDER, door_refs)}
+        location_rows.append((string(name), string(desc), doors))
+
+    creature_rows = []
+    for name, desc, location, is_pymon in reader.records(b"CRTS", CREATURE):
+        creature_rows.append((string(name), string(desc), string(location) or "None", bool(is_pymon)))
+
+    offset = reader.section(b"USER")
+    if offset is not None:
+        game_state.user_pymon, _ = _unpack_pymon(reader, offset)
+        game_state.pymon = None  # The loaded data replaces the live Pymon until one is built from it
+
+    game_state.bench_pymons = Bench()
+    offset = reader.section(b"BNCH")
+    if offset is not None:
+        (count,), offset = reader.unpack(COUNT, offset)
+        for _ in range(count):
+            pymon, offset = _unpack_pymon(reader, offset)
+            game_state.bench_pymons.add(BenchPymon.from_dict(pymon))
+
+    game_state.load_world_changes(item_rows, location_rows, creature_rows)
@@ -0,0 +1,19 @@
+import pytest
+from bench import Bench, BenchPymon
+
+
+def test_best_and_available_follow_energy():
+    bench = Bench([BenchPymon("A", "a", energy=1), BenchPymon("B", "b", energy=3), BenchPymon("C", "c", energy=0)])
+    assert bench.best().nickname == "B"
+    assert [pymon.nickname for pymon in bench.available()] == ["B", "A"]
+
+    bench.remove("B")
+    assert bench.best().nickname == "A"
+    bench.swap(bench.slot_of("A"), BenchPymon("D", "d", energy=2))
+    assert [pymon.nickname for pymon in bench.available()] == ["D"]
+
+
+def test_benched_energy_is_read_only():
+    pymon = BenchPymon("A", "a", energy=1)
+    with pytest.raises(AttributeError):
+        pymon.energy = 3
@@ -0,0 +1,199 @@
+import os
+import random
+import journal
+import snapshot
+from console import ScriptedConsole
+from creature import Pymon
+from journal import GameJournal
+from renderer import QUIET_RENDERER
+from session import GameSession
+from snapshot import SnapshotWriter, ITEM_V1, COUNT, pymon_dict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_FILES = {
+    "locations_file": os.path.join(HERE, "locations.csv"),
+    "creatures_file": os.path.join(HERE, "creatures.csv"),
+    "items_file": os.path.join(HERE, "items.csv"),
+}
+
+
+class WinningPymon(Pymon):
+    """Pymon that wins every encounter, so a challenge always ends in a capture."""
+
+    def get_player_choice(self):
+        return "p"
+
+    def get_move_opponent(self):
+        return "r"
+
+
+def new_session(seed):
+    """Load the bundled world, placing items and creatures from seed."""
+    session = GameSession()
+    session.load(rng=random.Random(seed), **DATA_FILES)
+    session.record.place_creatures(random.Random(seed))
+    return session
+
+
+def item_positions(record):
+    """Map the ID of every item on the ground to the name of its location."""
+    return {item.item_id: loc.name for loc in record.locations for item in loc.items}
+
+
+def start_game(seed=1):
+    """
+    Start a game next to a wild Pymon with an apple on the ground, and return
+    the Operation, the wild Pymon and the apple.
+    """
+    session = new_session(seed)
+    record = session.record
+    wild = next(creature for creature in record.creatures if isinstance(creature, Pymon) and creature.loc)
+    apple = next(item for item in record.items if item.name == "apple")
+    record.apply_changes([(apple.item_id, apple.name, wild.loc.name, True, True)], [], [])
+    operation = session.begin(WinningPymon("Kimimon", "test Pymon", wild.loc), renderer=QUIET_RENDERER)
+    return operation, wild, apple
+
+
+def play(operation, wild, apple):
+    """Pick and use the apple, capture the wild Pymon and switch to it."""
+    operation.console = ScriptedConsole([apple.name])
+    operation.pick_item()
+    operation.pymon.energy = 2
+    operation.console = ScriptedConsole(["1"])
+    operation.view_inventory()
+    operation.console = ScriptedConsole([wild.nickname])
+    operation.challenge_creature()
+    operation.console = ScriptedConsole(["1"])
+    operation.switch_active_pymon()
+
+
+def is_wild(record, nickname):
+    """Check whether a creature is still placed somewhere in the world."""
+    return any(creature.loc is not None for creature in record.creatures if creature.nickname == nickname)
+
+
+def assert_played(record, pymon, wild, apple, location_name):
+    """Check a reloaded record and Pymon against the state left by play()."""
+    assert pymon.nickname == wild.nickname
+    assert pymon.loc.name == location_name
+    assert [bench_pymon.nickname for bench_pymon in record.game_state.bench_pymons] == ["Kimimon"]
+    assert record.game_state.bench_pymons[0].energy == 3
+    assert record.game_state.bench_pymons[0].inventory == []  # The apple was eaten
+    assert not is_wild(record, wild.nickname)
+    assert wild.nickname not in [creature.nickname for creature in record.find_location(location_name).creatures]
+    assert apple.item_id not in item_positions(record)
+
+
+def test_snapshot_round_trip(tmp_path):
+    operation, wild, apple = start_game()
+    location_name = wild.loc.name
+    play(operation, wild, apple)
+    path = str(tmp_path / "save.pysnap")
+    operation.record.save_game_state(path, operation.pymon, snapshot=True)
+
+    loaded = new_session(2).record
+    pymon = loaded.load_game_state(path, snapshot=True)
+    assert_played(loaded, pymon, wild, apple, location_name)
+    assert item_positions(loaded) == item_positions(operation.record)
+
+
+def test_version_1_snapshot_loads(tmp_path, monkeypatch):
+    path = str(tmp_path / "old.pysnap")
+    writer = SnapshotWriter()
+    payload = bytearray(COUNT.pack(1))
+    payload += ITEM_V1.pack(writer.ref("apple"), writer.ref("Beach"), 3)
+    writer.add_section(b"ITEM", payload)
+    payload = bytearray()
+    snapshot._pack_pymon(writer, payload, pymon_dict("Oldmon", "old Pymon", "School", 2, True, 4, ["potion"], []))
+    writer.add_section(b"USER", payload)
+    monkeypatch.setattr(snapshot, "VERSION", 1)
+    writer.write(path)
+    monkeypatch.undo()
+
+    record = new_session(1).record
+    pymon = record.load_game_state(path, snapshot=True)
+    assert (pymon.nickname, pymon.loc.name, pymon.energy, pymon.has_immunity, pymon.move_count) == (
+        "Oldmon", "School", 2, True, 4
+    )
+    assert [item.name for item in pymon.inventory] == ["potion"]
+    assert "apple" in [item.name for item in record.find_location("Beach").items]
+
+
+def test_journal_replays_changes_after_the_snapshot(tmp_path):
+    operation, wild, apple = start_game()
+    location_name = wild.loc.name
+    path = str(tmp_path / "save.pyjournal")
+    operation.save_journal(path)  # The snapshot is taken before the pick and the capture
+    play(operation, wild, apple)
+    operation.close()
+
+    loaded = new_session(2).record
+    pymon = loaded.load_game_state(path, journal=GameJournal(path))
+    assert_played(loaded, pymon, wild, apple, location_name)
+    assert item_positions(loaded) == item_positions(operation.record)
+
+
+def test_journal_replays_after_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_EVERY", 2)
+    operation, wild, apple = start_game()
+    location_name = wild.loc.name
+    path = str(tmp_path / "save.pyjournal")
+    operation.save_journal(path)
+    play(operation, wild, apple)
+    operation.close()
+
+    loaded = new_session(2).record
+    pymon = loaded.load_game_state(path, journal=GameJournal(path))
+    assert_played(loaded, pymon, wild, apple, location_name)
+    assert item_positions(loaded) == item_positions(operation.record)
+
+
+def test_csv_round_trip(tmp_path):
+    operation, wild, apple = start_game()
+    location_name = wild.loc.name
+    play(operation, wild, apple)
+    path = str(tmp_path / "save.csv")
+    operation.record.save_game_state(path, operation.pymon)
+
+    loaded = new_session(2).record
+    pymon = loaded.load_game_state(path)
+    assert_played(loaded, pymon, wild, apple, location_name)
+    assert item_positions(loaded) == item_positions(operation.record)
+
+    # Saving the reloaded game writes the same file
+    resaved = str(tmp_path / "resave.csv")
+    loaded.save_game_state(resaved, pymon)
+    with open(path) as f, open(resaved) as g:
+        assert f.read() == g.read()
+
+
+def test_csv_save_without_item_ids_loads(tmp_path):
+    path = tmp_path / "old.csv"
+    path.write_text(
+        "[Items]\napple, Beach, True, True\n[Locations]\n[Creatures]\n"
+        "[UserPymon]\nOldmon, old Pymon\nSchool\n2, False, 1\n\n[BenchPymons]\n"
+    )
+    record = new_session(1).record
+    pymon = record.load_game_state(str(path))
+    assert (pymon.nickname, pymon.loc.name, pymon.energy, pymon.inventory) == ("Oldmon", "School", 2, [])
+    assert "apple" in [item.name for item in record.find_location("Beach").items]
+
+
+def test_changes_hold_only_what_moved():
+    operation, wild, apple = start_game()
+    record = operation.record
+    placed = {row[0] for row in record.changes()[0]}  # Items placed with the rng start changed
+    location_rows = record.changes()[1]
+    play(operation, wild, apple)
+
+    item_rows, new_location_rows, creature_rows = record.changes()
+    assert new_location_rows == location_rows == []
+    assert (apple.item_id, "apple", "None", True, True) in item_rows
+    assert {row[0] for row in item_rows} == placed | {apple.item_id}
+    assert (wild.nickname, wild.desc, "None", True) in creature_rows
+
+    # Applying the rows to a world loaded with another seed reproduces it
+    other = new_session(2).record
+    other.apply_changes(item_rows, new_location_rows, creature_rows)
+    assert item_positions(other) == item_positions(record)
+    assert not is_wild(other, wild.nickname)
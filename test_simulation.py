@@ -0,0 +1,22 @@
+import os
+from simulation import run_simulation
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def simulate(workers):
+    """Run a short seeded simulation on the bundled world."""
+    return run_simulation(
+        20,
+        seed=1,
+        workers=workers,
+        locations_file=os.path.join(HERE, "locations.csv"),
+        creatures_file=os.path.join(HERE, "creatures.csv"),
+        items_file=os.path.join(HERE, "items.csv"),
+    )
+
+
+def test_seeded_report_does_not_depend_on_worker_count():
+    report = simulate(1)
+    assert simulate(1) == report
+    assert simulate(2) == report
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+CACHE_EXT = ".cache"  # The cache of a world is written next to its locations file
+CACHE_VERSION = 2  # Bumped whenever the layout of the compiled world changes
+HASH_CHUNK = 1 << 20  # Bytes read at a time while hashing a source file
+MAGIC = b"PYWC"
+HEADER = struct.Struct("<4sIQ")  # magic, version, length of the JSON part
+ARRAY_KEY = "__array__"  # Marks an array stored after the JSON part, as [typecode, offset, length]
+
+
+def encode_cache(content):
+    """
+    Encode cache content (plain data and arrays) as JSON followed by the raw bytes of
+    its arrays. Only data is stored, so reading a cache can never run code.
+    """
+    blobs = []
+    size = 0
+
+    def encode_array(value):
+        nonlocal size
+        if not isinstance(value, array):
+            raise TypeError(f"Cannot cache a {type(value).__name__}")
+        blob = value.tobytes()
+        blobs.append(blob)
+        marker = {ARRAY_KEY: [value.typecode, size, len(blob)]}
+        size += len(blob)
+        return marker
+
+    document = json.dumps(
+        {"byteorder": sys.byteorder, "content": content}, default=encode_array, separators=(",", ":")
+    ).encode("utf-8")
+    return document, blobs
+
+
+def decode_cache(document, data):
+    """Decode content encoded by encode_cache, given the bytes that follow its JSON part."""
+
+    def decode_array(value):
+        marker = value.get(ARRAY_KEY)
+        if marker is None:
+            return value
+        typecode, offset, length = marker
+        decoded = array(typecode)
+        decoded.frombytes(data[offset:offset + length])
+        return decoded
+
+    decoded = json.loads(document, object_hook=decode_array)
+    if decoded.get("byteorder") != sys.byteorder:
+        return None  # Arrays written on a machine of another byte order
+    return decoded["content"]
+
+
+def file_digest(file_path):
+    """Get the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorldCache:
+    """
+    Cache of a compiled world, written next to the CSV files it was built from.
+    The world is stored as JSON with its arrays as raw bytes, never as pickled
+    objects, so a file dropped next to the data files cannot run code when read.
+    Every source file is keyed by its size, mtime and SHA-256. A source whose size
+    and mtime are unchanged is trusted without reading it; otherwise its content is
+    hashed, so a file that was only touched still hits the cache.
+    Any change to a source, a corrupt cache or a cache of an older layout counts as
+    a miss, and the caller rebuilds the world from the CSV files.
+    """
+
+    def __init__(self, locations_file, creatures_file, items_file):
+        """Initialize the cache of the world made of the given data files."""
+        self.__sources = (locations_file, creatures_file, items_file)
+        self.__path = locations_file + CACHE_EXT
+        self.__stamps = None  # (size, mtime_ns, digest) per source, read by load()
+
+    @property
+    def path(self):
+        """Getter for the cache file path."""
+        return self.__path
+
+    @staticmethod
+    def __stamp(file_path, cached=None):
+        """Get the (size, mtime_ns, digest) key of a source, reusing the cached digest if it is unchanged."""
+        stat = os.stat(file_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached
+        return stat.st_size, stat.st_mtime_ns, file_digest(file_path)
+
+    def load(self):
+        """Get the compiled world if the cache matches the data files, or None."""
+        cached = None
+        try:
+            cached = self.__read()
+        except Exception:
+            cached = None  # Missing or unreadable: rebuild it
+
+        stamps = tuple(tuple(stamp) for stamp in cached["stamps"]) if cached else (None,) * len(self.__sources)
+        try:
+            self.__stamps = tuple(
+                self.__stamp(file_path, stamp) for file_path, stamp in zip(self.__sources, stamps)
+            )
+        except OSError:
+            self.__stamps = None  # A data file is missing; loading it reports the error
+            return None
+        if cached is None:
+            return None
+        if [stamp[0::2] for stamp in self.__stamps] != [stamp[0::2] for stamp in stamps]:
+            return None  # A size or content changed
+        if self.__stamps != stamps:
+            self.save(cached["world"])  # Only mtimes changed: keep the new ones to skip hashing next time
+        return cached["world"]
+
+    def __read(self):
+        """Read the cache file as a dictionary of its stamps and world, or None if it is of another layout."""
+        with open(self.__path, "rb") as f:
+            data = f.read()
+        magic, version, document_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != CACHE_VERSION:
+            return None
+        start = HEADER.size
+        document = data[start:start + document_size]
+        cached = decode_cache(document, memoryview(data)[start + document_size:])
+        if cached is None or len(cached["stamps"]) != len(self.__sources):
+            return None
+        return cached
+
+    def save(self, world):
+        """
+        Write a compiled world atomically, keyed by the data files as load() found them.
+        A cache that cannot be written is skipped.
+        """
+        if self.__stamps is None:
+            self.__stamps = tuple(self.__stamp(file_path) for file_path in self.__sources)
+        tmp_path = self.__path + ".tmp"
+        try:
+            document, blobs = encode_cache({"stamps": self.__stamps, "world": world})
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, CACHE_VERSION, len(document)))
+                f.write(document)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp_path, self.__path)
+        except OSError:
+            pass  # e.g. a read-only data directory; the game still runs from the CSV files
+
+    def invalidate(self):
+        """Remove the cache, e.g. after the data files were edited."""
+        self.__stamps = None
+        try:
+            os.remove(self.__path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,176 @@
+"""
+Seeded generator of synthetic Pymon worlds for scale testing.
+
+Usage: python world_gen.py OUT_DIR [--size 1000] [--topology grid|tree|random] [--seed 0]
+                           [--creatures N] [--items N]
+
+Writes locations.csv, creatures.csv and items.csv to OUT_DIR. Every door is
+bidirectional: a door to the east of A leads to B exactly when the door to the west
+of B leads to A. The files load with: python pymon_game.py OUT_DIR/locations.csv
+OUT_DIR/creatures.csv OUT_DIR/items.csv
+"""
+import argparse
+import math
+import os
+import random
+from array import array
+from world_graph import DIRECTIONS, DIRECTION_INDEX, NO_DOOR
+
+TOPOLOGIES = ("grid", "tree", "random")
+OPPOSITE = tuple(DIRECTION_INDEX[d] for d in ("east", "south", "west", "north"))  # By direction index
+EXTRA_DOOR_RATIO = 0.5  # Doors added on top of the spanning tree of a random graph, per location
+MAX_TRIES = 20  # Attempts per extra door before a crowded random graph gives up on it
+# Item kinds written to items.csv: name, description, pickable, consumable, effect
+ITEM_KINDS = (
+    ("apple", "an edible green fruit that will boost your energy", "yes", "yes", "energy+1"),
+    ("potion", "applicable to your skin and will give your Pymon temporary immunity", "yes", "yes", "immunity"),
+    ("binocular", "an interesting device to see super far", "yes", "no", "reveal"),
+    ("tree", "a standing tree that does nothing much at least for now", "no", "no", "decoration"),
+)
+
+
+def location_name(i):
+    """Name of the generated location with index i."""
+    return f"L{i}"
+
+
+def new_doors(size):
+    """Door arrays, one per direction in DIRECTIONS order, with every door missing."""
+    return tuple(array("i", [NO_DOOR]) * size for _ in DIRECTIONS)
+
+
+def connect(doors, a, direction, b):
+    """Add a door from a to b in a direction, and the door back from b to a."""
+    doors[direction][a] = b
+    doors[OPPOSITE[direction]][b] = a
+
+
+def grid_doors(size, rng):
+    """Doors of a square grid, filled row by row."""
+    doors = new_doors(size)
+    width = max(1, math.isqrt(size))
+    east, south = DIRECTION_INDEX["east"], DIRECTION_INDEX["south"]
+    for i in range(size):
+        if i % width < width - 1 and i + 1 < size:
+            connect(doors, i, east, i + 1)
+        if i + width < size:
+            connect(doors, i, south, i + width)
+    return doors
+
+
+def tree_doors(size, rng):
+    """Doors of a random spanning tree: every new location hangs off a free door of an earlier one."""
+    doors = new_doors(size)
+    open_locations = [0] if size else []  # Locations that still have a free door
+    for i in range(1, size):
+        slot = rng.randrange(len(open_locations))
+        parent = open_locations[slot]
+        free = [d for d in range(len(DIRECTIONS)) if doors[d][parent] == NO_DOOR]
+        connect(doors, parent, rng.choice(free), i)
+        if len(free) == 1:
+            # The parent is full: swap it with the last open location and drop it
+            open_locations[slot] = open_locations[-1]
+            open_locations.pop()
+        open_locations.append(i)
+    return doors
+
+
+def random_doors(size, rng, extra_ratio=EXTRA_DOOR_RATIO):
+    """Doors of a connected random graph: a spanning tree plus random extra doors."""
+    doors = tree_doors(size, rng)
+    if size < 2:
+        return doors
+    for _ in range(int(size * extra_ratio)):
+        for _ in range(MAX_TRIES):
+            a = rng.randrange(size)
+            b = rng.randrange(size)
+            direction = rng.randrange(len(DIRECTIONS))
+            if (
+                a != b
+                and doors[direction][a] == NO_DOOR
+                and doors[OPPOSITE[direction]][b] == NO_DOOR
+                and b not in (doors[d][a] for d in range(len(DIRECTIONS)))
+            ):
+                connect(doors, a, direction, b)
+                break
+    return doors
+
+
+GENERATORS = {"grid": grid_doors, "tree": tree_doors, "random": random_doors}
+
+
+def write_locations(file_path, doors, size):
+    """Write a locations file with the doors of every location."""
+    with open(file_path, "w") as f:
+        f.write("name,description,west,north,east,south\n")
+        for i in range(size):
+            names = []
+            for direction_doors in doors:
+                target = direction_doors[i]
+                names.append("None" if target == NO_DOOR else location_name(target))
+            f.write(f"{location_name(i)}, generated location {i}, {', '.join(names)}\n")
+
+
+def write_creatures(file_path, count, rng):
+    """Write a creatures file; about half the creatures are adoptable Pymons."""
+    with open(file_path, "w") as f:
+        f.write("name, description, adoptable\n")
+        for i in range(count):
+            if rng.random() < 0.5:
+                f.write(f"Genmon{i}, generated Pymon {i}, yes\n")
+            else:
+                f.write(f"Critter{i}, generated animal {i}, no\n")
+
+
+def write_items(file_path, count, size, rng):
+    """Write an items file, placing every item in a random location through the location column."""
+    with open(file_path, "w") as f:
+        f.write("name, description, pickable, consumable, effect, location\n")
+        for _ in range(count):
+            kind = ", ".join(rng.choice(ITEM_KINDS))
+            location = location_name(rng.randrange(size)) if size else "None"
+            f.write(f"{kind}, {location}\n")
+
+
+def generate_world(directory, size, topology="grid", seed=0, creatures=None, items=None):
+    """
+    Write a world of size locations with the given topology to a directory.
+    By default there is one creature per 10 locations and one item per 5 locations.
+    Returns the paths of the locations, creatures and items files.
+    """
+    if topology not in GENERATORS:
+        raise ValueError(f"Unknown topology: {topology}")
+    if size < 1:
+        raise ValueError("A world needs at least one location.")
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    locations_file = os.path.join(directory, "locations.csv")
+    creatures_file = os.path.join(directory, "creatures.csv")
+    items_file = os.path.join(directory, "items.csv")
+
+    write_locations(locations_file, GENERATORS[topology](size, rng), size)
+    write_creatures(creatures_file, size // 10 + 1 if creatures is None else creatures, rng)
+    write_items(items_file, size // 5 + 1 if items is None else items, size, rng)
+    return locations_file, creatures_file, items_file
+
+
+def main():
+    """Command-line entry point of the world generator."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Pymon world.")
+    parser.add_argument("directory", help="directory to write the CSV files to")
+    parser.add_argument("--size", type=int, default=1000, help="number of locations")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="grid", help="shape of the door graph")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generator")
+    parser.add_argument("--creatures", type=int, default=None, help="number of creatures (default: size / 10)")
+    parser.add_argument("--items", type=int, default=None, help="number of items (default: size / 5)")
+    args = parser.parse_args()
+
+    files = generate_world(
+        args.directory, args.size, args.topology, args.seed, args.creatures, args.items
+    )
+    print(f"Generated a {args.topology} world of {args.size} locations. Play it with:")
+    print(f"python pymon_game.py {' '.join(files)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+from array import array
+from direction import Direction
+from exceptions import GameError
+
+DIRECTIONS = ("west", "north", "east", "south")  # Column order of doors in locations.csv
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+NO_DOOR = -1  # Adjacency value for a missing door
+
+
+class WorldGraph:
+    """
+    Compact store for the location graph.
+    Every location name gets an integer ID and the four doors of all locations
+    live in flat typed arrays (one per direction), so following a door is an
+    index lookup that allocates nothing.
+    A name can be interned before its location exists (a forward reference);
+    the ID is then reused once the location is added.
+    """
+
+    def __init__(self):
+        """Initialize an empty world graph."""
+        self.__names = []  # ID -> location name
+        self.__ids = {}  # location name -> ID
+        self.__locations = []  # ID -> Location, None while only referenced by a door
+        self.__doors = tuple(array("i") for _ in DIRECTIONS)  # direction -> ID -> ID
+        self.__version = 0  # Bumped on every change to the graph
+        self.__signatures = None  # door signature -> number of locations, built on first use
+
+    @property
+    def version(self):
+        """Getter for the version, which changes whenever the graph changes."""
+        return self.__version
+
+    def __len__(self):
+        """Number of interned location names, including forward references."""
+        return len(self.__names)
+
+    def intern(self, name):
+        """Return the ID for a location name, reserving a new one if needed."""
+        loc_id = self.__ids.get(name)
+        if loc_id is None:
+            loc_id = len(self.__names)
+            self.__ids[name] = loc_id
+            self.__names.append(name)
+            self.__locations.append(None)
+            for doors in self.__doors:
+                doors.append(NO_DOOR)
+            self.__version += 1
+        return loc_id
+
+    def add_location(self, location):
+        """Add a Location to the graph, attach it as a view and return its ID."""
+        loc_id = self.intern(location.name)
+        self.__locations[loc_id] = location
+        self.__version += 1
+        if self.__signatures is not None:
+            self.__count_signature(loc_id, 1)
+        location.attach(self, loc_id)
+        return loc_id
+
+    def rename(self, loc_id, new_name):
+        """Give a location ID a new name. Raises GameError if another ID already has it."""
+        old_name = self.__names[loc_id]
+        if new_name == old_name:
+            return
+        if new_name in self.__ids:
+            raise GameError(f"Location name already in use: {new_name}")
+        del self.__ids[old_name]
+        self.__ids[new_name] = loc_id
+        self.__names[loc_id] = new_name
+        self.__version += 1
+
+    def id_of(self, name):
+        """Get the ID of a location name, or None if it was never interned."""
+        return self.__ids.get(name)
+
+    def name_of(self, loc_id):
+        """Get the location name for an ID."""
+        return self.__names[loc_id]
+
+    def location(self, loc_id):
+        """Get the Location for an ID, or None if it is only a forward reference."""
+        return self.__locations[loc_id]
+
+    def find(self, name):
+        """Find a Location by name."""
+        loc_id = self.__ids.get(name)
+        if loc_id is None:
+            return None
+        return self.__locations[loc_id]
+
+    def connect(self, loc_id, direction, target_id):
+        """Set the door of a location in a direction to another location ID (or NO_DOOR)."""
+        doors = self.__doors[DIRECTION_INDEX[direction]]
+        if self.__signatures is not None and self.__locations[loc_id] is not None:
+            if doors[loc_id] == target_id:
+                return
+            self.__count_signature(loc_id, -1)
+            doors[loc_id] = target_id
+            self.__count_signature(loc_id, 1)
+        else:
+            doors[loc_id] = target_id
+        self.__version += 1
+
+    def signature(self, loc_id):
+        """Get the door signature of a location: the IDs behind its four doors."""
+        return tuple(doors[loc_id] for doors in self.__doors)
+
+    def __count_signature(self, loc_id, change):
+        """Add or remove a location from the door signature index."""
+        signature = self.signature(loc_id)
+        count = self.__signatures.get(signature, 0) + change
+        if count > 0:
+            self.__signatures[signature] = count
+        else:
+            self.__signatures.pop(signature, None)
+
+    def has_signature(self, signature):
+        """Check whether any location has exactly this door signature."""
+        if self.__signatures is None:
+            # Build the index once; connect and add_location keep it up to date afterwards
+            self.__signatures = {}
+            for loc_id, location in enumerate(self.__locations):
+                if location is not None:
+                    self.__count_signature(loc_id, 1)
+        return signature in self.__signatures
+
+    def neighbour_id(self, loc_id, direction):
+        """Get the ID behind a door, or NO_DOOR."""
+        index = DIRECTION_INDEX.get(direction)
+        if index is None:
+            return NO_DOOR
+        return self.__doors[index][loc_id]
+
+    def neighbour(self, loc_id, direction):
+        """Get the Location behind a door, or None if there is no existing location there."""
+        target = self.neighbour_id(loc_id, direction)
+        if target == NO_DOOR:
+            return None
+        return self.__locations[target]
+
+    def adjacency(self):
+        """
+        Get the door arrays, one per direction in DIRECTIONS order, for algorithms
+        that walk the whole graph. They must not be modified.
+        """
+        return self.__doors
+
+    def compiled(self):
+        """Get the location names by ID and the door arrays, for the world cache."""
+        return list(self.__names), tuple(array("i", doors) for doors in self.__doors)
+
+    def load_compiled(self, names, doors, locations):
+        """
+        Replace the graph with compiled names and door arrays, attaching the
+        Locations given as (ID, Location) pairs in one pass.
+        """
+        self.__names = list(names)
+        self.__ids = {name: loc_id for loc_id, name in enumerate(self.__names)}
+        self.__locations = [None] * len(self.__names)
+        self.__doors = tuple(array("i", direction_doors) for direction_doors in doors)
+        self.__signatures = None
+        self.__version += 1
+        for loc_id, location in locations:
+            self.__locations[loc_id] = location
+            location.attach(self, loc_id)
+
+    def set_doors(self, loc_id, doors):
+        """Replace all doors of a location from a Direction or a direction -> door dictionary."""
+        if isinstance(doors, Direction):
+            doors = doors.to_dict()
+        for direction in DIRECTIONS:
+            door = doors.get(direction)
+            if door is None or door == "None":
+                target = NO_DOOR
+            else:
+                target = self.intern(door if isinstance(door, str) else door.name)
+            self.connect(loc_id, direction, target)
+
+    def directions(self, loc_id):
+        """
+        Build a Direction object for a location.
+        Doors lead to Location objects, or to the location name if it does not exist yet.
+        """
+        doors = Direction()
+        for index, direction in enumerate(DIRECTIONS):
+            target = self.__doors[index][loc_id]
+            if target != NO_DOOR:
+                location = self.__locations[target]
+                doors.set_direction(
+                    location if location is not None else self.__names[target], direction
+                )
+        return doors